@@ -0,0 +1,275 @@
+"""Benchmarks for the simulation and rendering hot paths.
+
+Runs headless on SDL's dummy video and audio drivers and writes the results
+as JSON. Given a baseline written by an earlier run, it also prints how each
+benchmark changed and exits with status 1 if any got slower than the
+threshold allows.
+
+    python -m benchmarks.run --save-baseline   # Record a baseline on this machine
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from src import Snake, Food, Obstacle, WINDOW_WIDTH, WINDOW_HEIGHT, GRID_WIDTH, GRID_HEIGHT  # noqa: E402
+from src.food import FOOD_COLORS  # noqa: E402
+from src.particle_system import ParticleSystem  # noqa: E402
+from src.ui import GameRenderer  # noqa: E402
+
+RESULTS_FILE = "benchmarks/latest.json"
+BASELINE_FILE = "benchmarks/baseline.json"
+FORMAT = 1  # Bump when results stop being comparable with older files
+
+BOARD_CELLS = GRID_WIDTH * GRID_HEIGHT
+SNAKE_LENGTHS = (3, 30, 100, BOARD_CELLS // 2, BOARD_CELLS)
+FILL_RATIOS = (0.0, 0.25, 0.5, 0.9, 0.99)
+PARTICLE_COUNTS = (10, 100, 1000, 10000)
+RENDER_SNAKE_LENGTH = 30
+RENDER_FRAMES = 200  # Frames rendered per round
+
+
+def board_cycle():
+    """Every cell of the board in an order where each cell neighbours the next, and the last the first.
+
+    Columns are swept up and down over rows 1 and below, and row 0 leads back
+    to the start; boards with an odd number of columns are swept by rows.
+    """
+    if GRID_WIDTH % 2 == 0:
+        cells = []
+        for x in range(GRID_WIDTH):
+            rows = range(1, GRID_HEIGHT) if x % 2 == 0 else range(GRID_HEIGHT - 1, 0, -1)
+            cells.extend((x, y) for y in rows)
+        return cells + [(x, 0) for x in range(GRID_WIDTH - 1, -1, -1)]
+    if GRID_HEIGHT % 2 == 0:
+        cells = []
+        for y in range(GRID_HEIGHT):
+            columns = range(1, GRID_WIDTH) if y % 2 == 0 else range(GRID_WIDTH - 1, 0, -1)
+            cells.extend((x, y) for x in columns)
+        return cells + [(0, y) for y in range(GRID_HEIGHT - 1, -1, -1)]
+    raise ValueError("a board with an odd number of cells has no cycle through every cell")
+
+
+def cycle_snake(length, obstacles):
+    """A snake of length laid along the board cycle, and a step that moves it one cell further along."""
+    cycle = board_cycle()
+    following = {cell: cycle[(i + 1) % len(cycle)] for i, cell in enumerate(cycle)}
+    snake = Snake(obstacles.free_cells)
+    snake.positions = [cycle[-i % len(cycle)] for i in range(length)]  # Head at cycle[0], body behind it
+    snake.length = length
+
+    def step():
+        (x, y), (next_x, next_y) = snake.get_head_position(), following[snake.get_head_position()]
+        snake.direction = (next_x - x, next_y - y)
+        if snake.update(obstacles):
+            raise RuntimeError("benchmark snake crashed")
+
+    return snake, step
+
+
+def empty_board():
+    obstacles = Obstacle()
+    obstacles.positions = set()
+    return obstacles
+
+
+def bench_snake_update(length):
+    def setup():
+        _, step = cycle_snake(length, empty_board())
+        return step
+
+    return setup
+
+
+def bench_food_position(fill):
+    def setup():
+        obstacles = empty_board()
+        food = Food(obstacles)
+        blocked = round(fill * BOARD_CELLS) - len(food.foods)
+        free = [cell for cell in board_cycle() if cell not in food.positions]
+        obstacles.positions = random.sample(free, max(0, blocked))
+        return food._get_random_position  # pylint: disable=protected-access
+
+    return setup
+
+
+def particles(count):
+    """A particle system with count fresh particles spread over the window."""
+    system = ParticleSystem()
+    colors = list(FOOD_COLORS.values())
+    while len(system) < count:
+        batch = min(100, count - len(system))
+        system.emit(random.randrange(WINDOW_WIDTH), random.randrange(WINDOW_HEIGHT), random.choice(colors), count=batch)
+    return system
+
+
+def bench_particle_update(count):
+    def setup():
+        return particles(count).update
+
+    return setup
+
+
+def bench_particle_render(count):
+    def setup():
+        system = particles(count)
+        screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        return lambda: system.render(screen)
+
+    return setup
+
+
+def bench_render_game(dirty_rects):
+    def setup():
+        obstacles = empty_board()
+        snake, step = cycle_snake(RENDER_SNAKE_LENGTH, obstacles)
+        food = Food(obstacles)
+
+        # Food and obstacles go where the snake won't pass during a round
+        cycle = board_cycle()
+        path = set(cycle[: RENDER_FRAMES // 4 + 1]) | set(snake.positions)
+        spots = random.sample([cell for cell in cycle if cell not in path], 3 + 10)
+        food.foods = [food._create_food_item(cell) for cell in spots[:3]]  # pylint: disable=protected-access
+        obstacles.positions = spots[3:]
+
+        renderer = GameRenderer(dirty_rects=dirty_rects)
+        screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        start_time = pygame.time.get_ticks()
+        frame = 0
+
+        def render_frame():
+            # The snake moves every fourth frame and is interpolated in between, as at 15 moves a second
+            nonlocal frame
+            if frame % 4 == 0:
+                step()
+            snake.interpolation = (frame % 4 + 1) / 4
+            renderer.render_game(screen, snake, food, obstacles, 0, 0, start_time)
+            frame += 1
+
+        return render_frame
+
+    return setup
+
+
+def benchmarks():
+    """Benchmark name -> (setup, calls per round). Each round times calls to the callable setup returns."""
+    cases = {}
+    for length in SNAKE_LENGTHS:
+        cases[f"snake.update[length={length}]"] = (bench_snake_update(length), 1000)
+    for fill in FILL_RATIOS:
+        cases[f"food.random_position[fill={fill}]"] = (bench_food_position(fill), 10000)
+    for count in PARTICLE_COUNTS:
+        cases[f"particles.update[count={count}]"] = (bench_particle_update(count), max(5, 20000 // count))
+        cases[f"particles.render[count={count}]"] = (bench_particle_render(count), max(5, 5000 // count))
+    cases["render_game[full]"] = (bench_render_game(False), RENDER_FRAMES)
+    cases["render_game[dirty_rects]"] = (bench_render_game(True), RENDER_FRAMES)
+    return cases
+
+
+def measure(setup, number, repeat):
+    """Median and best microseconds per call over repeat rounds of number calls, after an untimed warm-up round."""
+    per_call = []
+    for _ in range(repeat + 1):
+        func = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number * 1e6)
+    per_call = per_call[1:]
+    return {"median_us": statistics.median(per_call), "min_us": min(per_call), "number": number, "repeat": repeat}
+
+
+def run(repeat=5, name_filter=None, scale=1.0):
+    """Run the benchmarks whose names contain name_filter, with calls per round scaled by scale."""
+    random.seed(0)
+    results = {}
+    for name, (setup, number) in benchmarks().items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(setup, max(1, int(number * scale)), repeat)
+    return {
+        "format": FORMAT,
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """(name, baseline µs, current µs, ratio, regressed) for each benchmark in both runs, by median."""
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_us"] / before["median_us"]
+        rows.append((name, before["median_us"], result["median_us"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _write(path, report):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the snake game's hot paths")
+    parser.add_argument("-o", "--output", default=RESULTS_FILE, help="Where to write this run's results")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write the results to {BASELINE_FILE}")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Slowdown over the baseline counted as a regression (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per benchmark; the median round is reported")
+    parser.add_argument("--filter", help="Only run benchmarks whose names contain this")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of the calls per round, for a rough check")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    report = run(args.repeat, args.filter, 0.1 if args.quick else 1.0)
+    pygame.quit()
+
+    width = max(len(name) for name in report["results"]) if report["results"] else 0
+    for name, result in report["results"].items():
+        print(f"{name:<{width}}  {result['median_us']:>10.2f} us  (best {result['min_us']:.2f})")
+    _write(args.output, report)
+    if args.save_baseline:
+        _write(BASELINE_FILE, report)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("format") != FORMAT:
+            print(f"Baseline {args.baseline} is from another benchmark format, not comparing")
+            return 0
+        rows = compare(report, baseline, args.threshold)
+        print(f"\nCompared with {args.baseline} ({baseline['meta']['created']}):")
+        for name, before, after, ratio, regressed in rows:
+            print(f"{name:<{width}}  {before:>10.2f} -> {after:>10.2f} us  {ratio:5.2f}x{'  REGRESSION' if regressed else ''}")
+        if any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
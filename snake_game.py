@@ -1,14 +1,53 @@
 import argparse
+import logging
+import os
+import random
+import sqlite3
+from datetime import datetime
 import pygame
-from src import Snake, Food, Obstacle, WINDOW_WIDTH, WINDOW_HEIGHT
-from src.sound import SoundManager
+from src import Snake, Food, Obstacle, WINDOW_WIDTH, WINDOW_HEIGHT, RENDER_FPS
+from src.core import collision_cause, eat_food, move
+from src.history import Run, RunHistory
+from src.recorder import FrameRecorder, RECORD_FORMATS
+from src.sound import SoundManager, DEFAULT_LATENCY_MS
 from src.ui import GameRenderer, Screenshot
+from src.profiler import profiler
 from src.game_state import GameState
+from src.food import preload_emojis
+from src.atlas import load_atlas, use_atlas
 
 # Initialize Pygame
 pygame.init()
 
 
+class FixedTimestep:
+    """Accumulates frame time and releases it as fixed-length game ticks."""
+
+    max_frame_ms = 250  # Drop time beyond this, or two ticks if longer, so a stall can't snowball
+
+    def __init__(self):
+        self.accumulator = 0.0
+
+    def reset(self):
+        """Discard accumulated time, e.g. when a game starts or resumes."""
+        self.accumulator = 0.0
+
+    def add(self, elapsed_ms, tick_ms=0):
+        """Add the time taken by the last frame, keeping at most two ticks of tick_ms or max_frame_ms of backlog."""
+        self.accumulator = min(self.accumulator + elapsed_ms, max(self.max_frame_ms, 2 * tick_ms))
+
+    def consume(self, tick_ms):
+        """Take one tick of tick_ms from the accumulator if enough time has built up."""
+        if self.accumulator < tick_ms:
+            return False
+        self.accumulator -= tick_ms
+        return True
+
+    def interpolation(self, tick_ms):
+        """Fraction of the next tick that has already elapsed, from 0 to 1."""
+        return min(self.accumulator / tick_ms, 1.0)
+
+
 def handle_direction_change(key, snake):
     directions = {
         pygame.K_UP: ((0, -1), (0, 1)),
@@ -30,23 +69,42 @@ def update_game_state(snake, obstacles, food, sound_manager, game_state, enable_
     # Check for collision with food
     food_properties = food.check_collision(snake.get_head_position())
     if food_properties:
-        sound_manager.play_eat_sound()
-        snake.length += food_properties["points"]
-        game_state.update_score(game_state.score + food_properties["points"])  # Update score directly in game_state
-        snake.handle_food_effect(food_properties)
+        sound_manager.play_eat_sound(food.last_eaten)
+        game_state.update_score(eat_food(snake, food_properties, game_state.score, pygame.time.get_ticks(), lambda: obstacles.add_obstacle(snake)))
 
         # Schedule screenshot if enabled
         if enable_screenshots and screenshot_manager:
             screenshot_manager.schedule()
 
-        # Add new obstacle every 10 points
-        if game_state.score % 10 == 0:
-            obstacles.add_obstacle(snake)
-            snake.speed += 1
-
     return False
 
 
+def record_run(history, game_state, snake, obstacles, food, seed):
+    """Store the game that just ended in the run history."""
+    new_head = move(snake.get_head_position(), snake.direction)
+    run = Run(
+        score=game_state.score,
+        duration_ms=pygame.time.get_ticks() - game_state.start_time,
+        max_length=len(snake.positions),
+        death_cause=collision_cause(snake, new_head, obstacles.positions),
+        seed=seed,
+        food_eaten=dict(food.eaten),
+    )
+    history.record_run(run)
+
+
+def shutdown(game_state, screenshot_manager=None, recorder=None, history=None):
+    """Finish pending saves, close the run history and close pygame."""
+    game_state.flush_high_score()
+    if screenshot_manager:
+        screenshot_manager.flush()
+    if recorder:
+        recorder.close()
+    if history is not None:
+        history.close()
+    pygame.quit()
+
+
 def main():
     # Initialize start_time with current ticks
     game_state = GameState()
@@ -54,71 +112,119 @@ def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Snake Game")
     parser.add_argument("--screenshots", action="store_true", help="Enable screenshots when snake eats food")
+    parser.add_argument("--dirty-rects", action="store_true", help="Only redraw and update the parts of the window that change")
+    parser.add_argument("--history", default="runs.db", help="SQLite file recording every run")
+    parser.add_argument("--record", nargs="?", const="recordings", metavar="DIR", help="Record every frame into a new folder under DIR (default: recordings)")
+    parser.add_argument("--record-format", choices=RECORD_FORMATS, default="png", help="Write recordings as a PNG sequence or raw RGB frames")
+    parser.add_argument("--audio-latency", type=float, default=DEFAULT_LATENCY_MS, metavar="MS", help="Audio output buffer budget in milliseconds")
     args = parser.parse_args()
 
     # Initialize game components
     game_screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Modern Snake Game")
     clock = pygame.time.Clock()
+    timestep = FixedTimestep()
+    frame_ms = 0
+
+    # Load the pre-rasterized art before anything draws it
+    use_atlas(load_atlas())
 
     # Initialize managers
-    sound_manager = SoundManager()
-    renderer = GameRenderer()
+    sound_manager = SoundManager(latency_ms=args.audio_latency)
+    renderer = GameRenderer(dirty_rects=args.dirty_rects)
     screenshot_manager = Screenshot() if args.screenshots else None
+    recorder = None
+    if args.record:
+        directory = os.path.join(args.record, datetime.now().strftime("snake_%Y%m%d_%H%M%S"))
+        recorder = FrameRecorder(directory, (WINDOW_WIDTH, WINDOW_HEIGHT), args.record_format, RENDER_FPS)
+    try:
+        history = RunHistory(args.history)
+    except sqlite3.Error as e:
+        logging.error("Failed to open run history: %s", str(e))
+        history = None
 
     # Start background music
     sound_manager.play_background_music()
 
+    # Rasterize the food emoji while the start menu shows
+    preload_emojis(background=True)
+
     # Game objects
     snake = None
     obstacles = None
     food = None
-
-    while True:
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    pygame.quit()
-                    return
-                if event.key == pygame.K_RETURN and (not game_state.is_playing or game_state.is_game_over):
-                    # Start new game
-                    snake = Snake()
-                    obstacles = Obstacle()
-                    food = Food(obstacles)
-                    game_state.start_game()
-                if event.key == pygame.K_ESCAPE and game_state.is_playing:
-                    game_state.toggle_pause()
-                    if game_state.is_paused:
-                        sound_manager.pause_background_music()
-                    else:
-                        sound_manager.resume_background_music()
+    seed = None
+
+    # Pending saves and the recording are finished however the loop ends
+    try:
+        while True:
+            profiler.begin_frame()
+
+            # Handle events
+            with profiler.span("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        return
+                    if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                        renderer.invalidate()
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_q:
+                            return
+                        if event.key == pygame.K_F3:
+                            renderer.toggle_profiler()
+                        if event.key == pygame.K_RETURN and (not game_state.is_playing or game_state.is_game_over):
+                            # Start new game from a recorded seed
+                            seed = random.randrange(2**32)
+                            random.seed(seed)
+                            obstacles = Obstacle()
+                            snake = Snake(obstacles.free_cells)
+                            food = Food(obstacles)
+                            game_state.start_game()
+                            timestep.reset()
+                        if event.key == pygame.K_ESCAPE and game_state.is_playing:
+                            game_state.toggle_pause()
+                            timestep.reset()
+                            if game_state.is_paused:
+                                sound_manager.pause_background_music()
+                            else:
+                                sound_manager.resume_background_music()
+                        if game_state.is_playing and not game_state.is_paused:
+                            handle_direction_change(event.key, snake)
+
+            # Update game state in fixed ticks at the snake's speed
+            with profiler.span("update"):
                 if game_state.is_playing and not game_state.is_paused:
-                    handle_direction_change(event.key, snake)
-
-        # Update game state
-        if game_state.is_playing and not game_state.is_paused:
-            if update_game_state(snake, obstacles, food, sound_manager, game_state, args.screenshots, screenshot_manager):
-                game_state.end_game()
-
-        # Render current frame
-        if game_state.is_playing:
-            renderer.render_game(game_screen, snake, food, obstacles, game_state.score, game_state.high_score, game_state.start_time, screenshot_manager)
-            if game_state.is_paused:
-                renderer.show_pause_menu(game_screen, game_state.score)
-        elif game_state.is_game_over:
-            renderer.show_game_over(game_screen, game_state.score, game_state.high_score)
-        else:  # Game is not started
-            renderer.show_start_menu(game_screen)
-
-        # Update display once per frame
-        pygame.display.flip()
-
-        # Control game speed
-        clock.tick(snake.speed if snake and game_state.is_playing and not game_state.is_paused else 30)
+                    timestep.add(frame_ms, 1000 / snake.speed)
+                    while timestep.consume(1000 / snake.speed):
+                        if update_game_state(snake, obstacles, food, sound_manager, game_state, args.screenshots, screenshot_manager):
+                            game_state.end_game()
+                            if history is not None:
+                                record_run(history, game_state, snake, obstacles, food, seed)
+                            break
+                    snake.interpolation = timestep.interpolation(1000 / snake.speed)
+
+            # Render current frame
+            if game_state.is_playing:
+                renderer.render_game(game_screen, snake, food, obstacles, game_state.score, game_state.high_score, game_state.start_time, screenshot_manager)
+                if game_state.is_paused:
+                    renderer.show_pause_menu(game_screen, game_state.score)
+            elif game_state.is_game_over:
+                renderer.show_game_over(game_screen, game_state.score, game_state.high_score)
+            else:  # Game is not started
+                renderer.show_start_menu(game_screen)
+
+            # Update display once per frame
+            with profiler.span("flip"):
+                renderer.present()
+            if recorder:
+                recorder.capture(game_screen)
+            profiler.end_frame()
+
+            # Render at a steady frame rate; game speed is handled by the timestep
+            frame_ms = clock.tick(RENDER_FPS)
+
+    finally:
+        shutdown(game_state, screenshot_manager, recorder, history)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 from .snake import Snake
 from .food import Food
 from .obstacle import Obstacle
+from .core import GameCore
 from .constants import *
@@ -0,0 +1,221 @@
+"""Pre-rasterized atlas of the game's static art.
+
+The grid background, the rounded tiles used for snake segments and
+obstacles, and the food emoji are baked into one raw RGBA image plus a JSON
+index. At startup the image is memory-mapped and wrapped with
+``pygame.image.frombuffer``, so none of the art has to be drawn or
+rasterized again. The index records a hash of every constant the art
+depends on, and load_atlas rebuilds an atlas that is missing or stale.
+
+Build it ahead of time with ``python -m src.atlas``.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+from types import SimpleNamespace
+import pygame
+from pygame_emojis import load_emoji
+from .constants import (
+    WINDOW_WIDTH,
+    WINDOW_HEIGHT,
+    GRID_SIZE,
+    BACKGROUND,
+    GRID_COLOR,
+    OBSTACLE_COLOR,
+    SNAKE_GRADIENT_COLORS,
+    FOOD_EMOJIS,
+    EMOJI_SIZE,
+    draw_grid,
+    draw_rounded_rect,
+)
+
+ATLAS_DIRECTORY = "assets"
+ATLAS_IMAGE = "atlas.rgba"
+ATLAS_INDEX = "atlas.json"
+ATLAS_FORMAT = 1  # Bump when the way sprites are drawn changes
+
+_in_use = SimpleNamespace(atlas=None)  # Atlas in use, see use_atlas
+_tiles = {}  # Tiles drawn at runtime for colors missing from the atlas
+
+
+class Atlas:
+    """A loaded atlas image and the named sprites cut from it."""
+
+    def __init__(self, surface, sprites, buffer=None):
+        self.surface = surface
+        self.sprites = sprites  # Name -> subsurface of surface
+        self._buffer = buffer  # Memory map backing surface, kept alive with it
+
+    def __contains__(self, name):
+        return name in self.sprites
+
+    def convert(self):
+        """Copy the sprites into the display's pixel format, so blits don't convert them every time."""
+        surface = self.surface.convert_alpha()
+        self.sprites = {name: surface.subsurface(pygame.Rect(sprite.get_offset(), sprite.get_size())) for name, sprite in self.sprites.items()}
+        self.surface = surface
+        self._buffer = None  # The copy no longer reads from the memory map
+
+
+def tile_name(color):
+    r, g, b = color
+    return f"tile:{r},{g},{b}"
+
+
+def emoji_name(emoji):
+    return "emoji:" + emoji
+
+
+def draw_tile(color):
+    """Draw the rounded grid tile used for snake segments and obstacles."""
+    surface = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
+    draw_rounded_rect(surface, color, pygame.Rect(2, 2, GRID_SIZE - 4, GRID_SIZE - 4), 10)
+    return surface
+
+
+def use_atlas(atlas):
+    """Serve sprites from atlas, or stop using an atlas if it is None.
+
+    Once a display mode is set, the atlas is converted to its pixel format.
+    """
+    if atlas is not None and pygame.display.get_surface() is not None:
+        atlas.convert()
+    _in_use.atlas = atlas
+
+
+def get_sprite(name):
+    """Return a sprite from the atlas in use, or None if it isn't there."""
+    if _in_use.atlas is None:
+        return None
+    return _in_use.atlas.sprites.get(name)
+
+
+def get_tile(color):
+    """Return the grid tile for color, from the atlas if it has one."""
+    tile = get_sprite(tile_name(color))
+    if tile is None:
+        color = tuple(color)
+        tile = _tiles.get(color)
+        if tile is None:
+            tile = _tiles[color] = draw_tile(color)
+    return tile
+
+
+def _art_inputs():
+    """Every value the baked art depends on."""
+    return {
+        "format": ATLAS_FORMAT,
+        "window": [WINDOW_WIDTH, WINDOW_HEIGHT],
+        "grid_size": GRID_SIZE,
+        "background": BACKGROUND,
+        "grid_color": GRID_COLOR,
+        "tile_colors": SNAKE_GRADIENT_COLORS + [OBSTACLE_COLOR],
+        "emojis": [emoji for emojis in FOOD_EMOJIS.values() for emoji in emojis],
+        "emoji_size": EMOJI_SIZE,
+    }
+
+
+def content_hash():
+    """Hash of the art inputs, used to spot a stale atlas."""
+    inputs = json.dumps(_art_inputs(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(inputs.encode("utf-8")).hexdigest()
+
+
+def _bake():
+    """Draw every sprite, background first."""
+    inputs = _art_inputs()
+    background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+    background.fill(BACKGROUND)
+    draw_grid(background)
+    sprites = {"background": background}
+    for color in inputs["tile_colors"]:
+        sprites[tile_name(color)] = draw_tile(color)
+    for emoji in inputs["emojis"]:
+        sprites[emoji_name(emoji)] = load_emoji(emoji, inputs["emoji_size"])
+    return sprites
+
+
+def _pack(sprites):
+    """Lay sprites out left to right on shelves. Returns the atlas size and name -> rect."""
+    width = max(sprite.get_width() for sprite in sprites.values())
+    rects = {}
+    x = y = shelf_height = 0
+    for name, sprite in sprites.items():
+        w, h = sprite.get_size()
+        if x + w > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        rects[name] = [x, y, w, h]
+        x += w
+        shelf_height = max(shelf_height, h)
+    return (width, y + shelf_height), rects
+
+
+def _write_atomic(path, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def build_atlas(directory=ATLAS_DIRECTORY):
+    """Bake the atlas image and index into directory."""
+    sprites = _bake()
+    size, rects = _pack(sprites)
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    for name, sprite in sprites.items():
+        # RGBA_MAX onto the transparent atlas copies pixels, alpha included, unblended
+        image.blit(sprite, rects[name][:2], special_flags=pygame.BLEND_RGBA_MAX)
+
+    os.makedirs(directory, exist_ok=True)
+    index = {"hash": content_hash(), "size": list(size), "sprites": rects}
+    # Index last, so an index with the current hash always has its image
+    _write_atomic(os.path.join(directory, ATLAS_IMAGE), pygame.image.tobytes(image, "RGBA"))
+    _write_atomic(os.path.join(directory, ATLAS_INDEX), json.dumps(index, ensure_ascii=False).encode("utf-8"))
+
+
+def _read_index(directory):
+    try:
+        with open(os.path.join(directory, ATLAS_INDEX), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def load_atlas(directory=ATLAS_DIRECTORY, rebuild=True):
+    """Memory-map the atlas in directory, rebuilding it first if it is missing or stale.
+
+    Returns None if there is no usable atlas, in which case the art is drawn
+    at runtime as before.
+    """
+    index = _read_index(directory)
+    if index is None or index.get("hash") != content_hash():
+        if not rebuild:
+            return None
+        try:
+            build_atlas(directory)
+        except (OSError, ValueError, pygame.error) as e:
+            logging.error("Failed to build sprite atlas: %s", str(e))
+            return None
+        index = _read_index(directory)
+
+    try:
+        width, height = index["size"]
+        with open(os.path.join(directory, ATLAS_IMAGE), "rb") as file:
+            # Copy-on-write, so drawing on a sprite never touches the file
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(buffer) != width * height * 4:
+            raise ValueError("atlas image does not match its index")
+        surface = pygame.image.frombuffer(buffer, (width, height), "RGBA")
+        sprites = {name: surface.subsurface(rect) for name, rect in index["sprites"].items()}
+    except (KeyError, TypeError, OSError, ValueError, pygame.error) as e:
+        logging.error("Failed to load sprite atlas: %s", str(e))
+        return None
+    return Atlas(surface, sprites, buffer)
+
+
+if __name__ == "__main__":
+    build_atlas()
+    print(f"Sprite atlas written to {ATLAS_DIRECTORY}/")
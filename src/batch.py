@@ -0,0 +1,269 @@
+"""Vectorised batch of headless games.
+
+BatchGame holds many independent boards as NumPy arrays and advances all of
+them with a single ``step`` call, following the same rules as GameCore and
+``snake_game.update_game_state``: wraparound, food points and speed effects,
+and a new obstacle plus a speed increment every 10 points.
+
+Cells are addressed by their flat index ``y * width + x``. Each snake body is
+a ring buffer of cell indices with the head at ``head_slot``, and
+``occupancy`` counts the segments on every cell so collisions are a lookup.
+"""
+
+import numpy as np
+from .constants import (
+    GRID_WIDTH,
+    GRID_HEIGHT,
+    INITIAL_SPEED,
+    SPEED_INCREMENT,
+    LEVEL_POINTS,
+    MIN_SPEED,
+    MAX_SPEED,
+    OBSTACLE_COUNT,
+    FOOD_TYPES,
+)
+from .core import DIRECTIONS
+
+FOOD_TYPE_NAMES = tuple(FOOD_TYPES)  # Food type codes index into this
+DIRECTION_VECTORS = np.array(DIRECTIONS)  # Action codes index into this
+
+_POINTS = np.array([FOOD_TYPES[name]["points"] for name in FOOD_TYPE_NAMES])
+_SPEED_CHANGE = np.array([FOOD_TYPES[name]["speed_change"] for name in FOOD_TYPE_NAMES])
+_DURATION = np.array([FOOD_TYPES[name]["duration"] for name in FOOD_TYPE_NAMES])
+_FOOD_THRESHOLDS = np.array([0.60, 0.75, 0.875])  # Same odds as core.roll_food_type
+
+
+class BatchGame:
+    """N snake games stepped together."""
+
+    def __init__(self, num_games, width=GRID_WIDTH, height=GRID_HEIGHT, max_foods=3, seed=None):
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.max_foods = max_foods
+        self.rng = np.random.default_rng(seed)
+
+        # Snake bodies
+        self.body = np.zeros((num_games, self.cells), dtype=np.int32)
+        self.head_slot = np.zeros(num_games, dtype=np.int64)
+        self.body_length = np.zeros(num_games, dtype=np.int64)  # Segments currently on the board
+        self.length = np.zeros(num_games, dtype=np.int64)  # Target length, as Snake.length
+        self.occupancy = np.zeros((num_games, self.cells), dtype=np.uint8)
+        self.direction = np.zeros((num_games, 2), dtype=np.int64)
+
+        # Board contents
+        self.obstacles = np.zeros((num_games, self.cells), dtype=bool)
+        self.food = np.full((num_games, self.cells), -1, dtype=np.int8)  # Food type code, -1 if empty
+
+        # Speed, effects and scoring
+        self.speed = np.zeros(num_games, dtype=np.int64)
+        self.base_speed = np.zeros(num_games, dtype=np.int64)
+        self.effect_end_time = np.zeros(num_games, dtype=np.int64)
+        self.time = np.zeros(num_games, dtype=np.int64)  # Simulated ms per board
+        self.ticks = np.zeros(num_games, dtype=np.int64)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.done = np.zeros(num_games, dtype=bool)
+
+        # Initial obstacles stay away from the edges and the snake's start
+        x, y = np.arange(self.cells) % width, np.arange(self.cells) // width
+        inner = (x >= 2) & (x <= width - 3) & (y >= 2) & (y <= height - 3)
+        center = (abs(x - width // 2) <= 2) & (abs(y - height // 2) <= 2)
+        self._obstacle_zone = inner & ~center
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games on all boards, or on the boards selected by mask."""
+        rows = np.arange(self.num_games) if mask is None else np.flatnonzero(mask)
+        if rows.size == 0:
+            return
+
+        direction = DIRECTION_VECTORS[self.rng.integers(0, len(DIRECTIONS), rows.size)]
+        self.direction[rows] = direction
+        self.body[rows] = 0
+        self.occupancy[rows] = 0
+        for slot in range(3):  # Tail first, head in slot 2
+            behind = 2 - slot
+            x = (self.width // 2 - direction[:, 0] * behind) % self.width
+            y = (self.height // 2 - direction[:, 1] * behind) % self.height
+            self.body[rows, slot] = y * self.width + x
+            self.occupancy[rows, y * self.width + x] += 1
+        self.head_slot[rows] = 2
+        self.body_length[rows] = 3
+        self.length[rows] = 3
+
+        self.speed[rows] = INITIAL_SPEED
+        self.base_speed[rows] = INITIAL_SPEED
+        self.effect_end_time[rows] = 0
+        self.time[rows] = 0
+        self.ticks[rows] = 0
+        self.score[rows] = 0
+        self.done[rows] = False
+
+        self.obstacles[rows] = False
+        cells, valid = self._choose_cells(np.broadcast_to(self._obstacle_zone, (rows.size, self.cells)), OBSTACLE_COUNT)
+        self.obstacles[np.broadcast_to(rows[:, None], cells.shape)[valid], cells[valid]] = True
+
+        self.food[rows] = -1
+        for _ in range(self.max_foods):
+            self._spawn_food(rows)
+
+    def load(self, index, core):
+        """Copy the state of a GameCore into board index."""
+        if (core.width, core.height) != (self.width, self.height):
+            raise ValueError("GameCore board size does not match the batch")
+
+        positions = [y * self.width + x for x, y in core.snake.positions]
+        self.body[index] = 0
+        self.body[index, : len(positions)] = positions[::-1]
+        self.head_slot[index] = len(positions) - 1
+        self.body_length[index] = len(positions)
+        self.length[index] = core.snake.length
+        self.occupancy[index] = np.bincount(positions, minlength=self.cells)
+        self.direction[index] = core.snake.direction
+
+        self.obstacles[index] = False
+        self.obstacles[index, [y * self.width + x for x, y in core.obstacles]] = True
+        self.food[index] = -1
+        for (x, y), type_name in core.foods.items():
+            self.food[index, y * self.width + x] = FOOD_TYPE_NAMES.index(type_name)
+
+        self.speed[index] = core.snake.speed
+        self.base_speed[index] = core.snake.effects.base_speed
+        self.effect_end_time[index] = core.snake.effects.effect_end_time
+        self.time[index] = core.time
+        self.ticks[index] = core.ticks
+        self.score[index] = core.score
+        self.done[index] = core.game_over
+
+    def positions(self, index):
+        """Return the snake on board index as (x, y) tuples, head first."""
+        slots = (self.head_slot[index] - np.arange(self.body_length[index])) % self.cells
+        return [(int(cell % self.width), int(cell // self.width)) for cell in self.body[index, slots]]
+
+    def food_positions(self, index):
+        """Return the food on board index as a position -> food type name dict."""
+        cells = np.flatnonzero(self.food[index] >= 0)
+        return {(int(cell % self.width), int(cell // self.width)): FOOD_TYPE_NAMES[self.food[index, cell]] for cell in cells}
+
+    def _choose_cells(self, allowed, count):
+        """Pick count distinct allowed cells per row uniformly at random.
+
+        Returns the chosen cells and a mask of which picks were valid, which
+        is False where a row had fewer than count allowed cells.
+        """
+        keys = self.rng.random(allowed.shape)
+        keys[~allowed] = -1.0
+        if count == 1:
+            cells = np.argmax(keys, axis=1)[:, None]
+        else:
+            cells = np.argpartition(-keys, count - 1, axis=1)[:, :count]
+        return cells, np.take_along_axis(keys, cells, axis=1) >= 0
+
+    def _spawn_food(self, rows):
+        """Place one new food item on each board in rows, if it has room."""
+        if rows.size == 0:
+            return
+        allowed = ~self.obstacles[rows] & (self.food[rows] < 0) & (self.occupancy[rows] == 0)
+        cells, valid = self._choose_cells(allowed, 1)
+        types = np.searchsorted(_FOOD_THRESHOLDS, self.rng.random(rows.size), side="right")
+        valid = valid[:, 0]
+        self.food[rows[valid], cells[valid, 0]] = types[valid]
+
+    def _add_obstacle(self, rows):
+        """Add an obstacle on each board in rows, clear of the snake, its danger zone and the food."""
+        if rows.size == 0:
+            return
+        head = self.body[rows, self.head_slot[rows]]
+        x, y = head % self.width, head // self.width
+        dx, dy = self.direction[rows, 0], self.direction[rows, 1]
+        danger = []
+        for distance in range(1, 4):
+            fx, fy = x + dx * distance, y + dy * distance
+            danger.append((fx % self.width) + (fy % self.height) * self.width)
+            danger.append(((fx + dy) % self.width) + ((fy - dx) % self.height) * self.width)  # Left
+            danger.append(((fx - dy) % self.width) + ((fy + dx) % self.height) * self.width)  # Right
+
+        allowed = ~self.obstacles[rows] & (self.occupancy[rows] == 0) & (self.food[rows] < 0)
+        allowed[np.arange(rows.size)[:, None], np.stack(danger, axis=1)] = False
+        cells, valid = self._choose_cells(allowed, 1)
+        valid = valid[:, 0]
+        self.obstacles[rows[valid], cells[valid, 0]] = True
+
+    def step(self, actions=None):
+        """Advance every running board by one tick.
+
+        actions holds a direction index into DIRECTIONS per board, or -1 to
+        keep going straight; reversing onto the body is ignored. Returns the
+        food type code eaten on each board this tick (-1 for none) and a copy
+        of the done flags. Boards that are done are left untouched until
+        they are reset.
+        """
+        eaten = np.full(self.num_games, -1, dtype=np.int8)
+        rows = np.flatnonzero(~self.done)
+
+        if actions is not None:
+            actions = np.asarray(actions)[rows]
+            turning = rows[actions >= 0]
+            new_direction = DIRECTION_VECTORS[actions[actions >= 0]]
+            allowed = np.any(new_direction + self.direction[turning] != 0, axis=1)
+            self.direction[turning[allowed]] = new_direction[allowed]
+
+        if rows.size == 0:
+            return eaten, self.done.copy()
+
+        self.time[rows] += 1000 // self.speed[rows]
+        self.ticks[rows] += 1
+
+        # End expired speed effects
+        expired = rows[(self.effect_end_time[rows] > 0) & (self.time[rows] >= self.effect_end_time[rows])]
+        self.speed[expired] = self.base_speed[expired]
+        self.effect_end_time[expired] = 0
+
+        # Next head cell, wrapping around the edges
+        head = self.body[rows, self.head_slot[rows]]
+        x = (head % self.width + self.direction[rows, 0]) % self.width
+        y = (head // self.width + self.direction[rows, 1]) % self.height
+        new_head = y * self.width + x
+
+        # Collide with obstacles or the body, excluding the tail which will move
+        tail_slot = (self.head_slot[rows] - self.body_length[rows] + 1) % self.cells
+        tail = self.body[rows, tail_slot]
+        crashed = self.obstacles[rows, new_head] | (self.occupancy[rows, new_head] > (new_head == tail))
+        self.done[rows[crashed]] = True
+        rows, new_head, tail = rows[~crashed], new_head[~crashed], tail[~crashed]
+
+        # Move: push the head, then pop the tail unless growing
+        slot = (self.head_slot[rows] + 1) % self.cells
+        self.body[rows, slot] = new_head
+        self.head_slot[rows] = slot
+        self.occupancy[rows, new_head] += 1
+        self.body_length[rows] += 1
+        popped = (self.body_length[rows] > self.length[rows]) | (self.body_length[rows] > self.cells)
+        self.occupancy[rows[popped], tail[popped]] -= 1
+        self.body_length[rows[popped]] -= 1
+
+        # Eat food
+        food_type = self.food[rows, new_head]
+        ate = food_type >= 0
+        rows, new_head, food_type = rows[ate], new_head[ate], food_type[ate]
+        self.food[rows, new_head] = -1
+        eaten[rows] = food_type
+        self.length[rows] += _POINTS[food_type]
+        self.score[rows] += _POINTS[food_type]
+
+        changed = _SPEED_CHANGE[food_type] != 0
+        boosted = rows[changed]
+        self.base_speed[boosted] = self.speed[boosted]
+        self.speed[boosted] = np.clip(self.speed[boosted] + _SPEED_CHANGE[food_type[changed]], MIN_SPEED, MAX_SPEED)
+        timed = _DURATION[food_type[changed]] > 0
+        self.effect_end_time[boosted[timed]] = self.time[boosted[timed]] + _DURATION[food_type[changed]][timed]
+        self._spawn_food(rows)
+
+        # Each new level adds an obstacle and speeds the snake up, as in core.eat_food
+        milestone = rows[self.score[rows] % LEVEL_POINTS == 0]
+        self._add_obstacle(milestone)
+        self.speed[milestone] += SPEED_INCREMENT
+
+        return eaten, self.done.copy()
@@ -22,6 +22,13 @@ GOLDEN_APPLE_COLOR = (255, 215, 0)  # Gold color
 SPEED_FRUIT_COLOR = (138, 43, 226)  # Purple color
 SLOW_FRUIT_COLOR = (65, 105, 225)  # Royal blue color
 
+# Snake body colors, head to tail
+SNAKE_GRADIENT_COLORS = [
+    (50, 205, 50),  # Light green
+    (34, 139, 34),  # Forest green
+    (0, 100, 0),  # Dark green
+]
+
 # Game settings
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -29,8 +36,12 @@ GRID_SIZE = 40
 GRID_WIDTH = WINDOW_WIDTH // GRID_SIZE
 GRID_HEIGHT = WINDOW_HEIGHT // GRID_SIZE
 INITIAL_SPEED = 6  # Initial speed
-SPEED_INCREMENT = 1  # Speed increase per 10 points
+SPEED_INCREMENT = 1  # Speed increase per level
+LEVEL_POINTS = 10  # Points per level; each new level adds an obstacle and speeds the snake up
+MIN_SPEED = 2  # Slowest speed a food effect can apply
+MAX_SPEED = 12  # Fastest speed a food effect can apply
 OBSTACLE_COUNT = 3
+RENDER_FPS = 60  # Frame rate for drawing; game logic ticks at the snake's speed
 
 # Food types and their effects
 FOOD_TYPES = {
@@ -44,6 +55,15 @@ FOOD_TYPES = {
     },  # 5 seconds slow effect
 }
 
+# Emoji drawn for each food type, one picked at random per item
+FOOD_EMOJIS = {
+    "normal": ["🍕", "🍇", "🍪", "🍓"],
+    "golden": ["🌟", "⭐", "🌞"],
+    "speed": ["⚡", "🚀", "💨"],
+    "slow": ["🐌", "🦥", "🐢"],
+}
+EMOJI_SIZE = (GRID_SIZE - 4, GRID_SIZE - 4)
+
 # Direction constants
 UP = (0, -1)
 DOWN = (0, 1)
@@ -51,7 +71,23 @@ LEFT = (-1, 0)
 RIGHT = (1, 0)
 
 
+# Loaded fonts by (size, bold); emptied by pygame.quit() since fonts die with it
+_font_cache = {}
+
+
 def get_font(size, bold=True):
+    """Return the game font at the given size, loading it on first use."""
+    key = (size, bold)
+    font = _font_cache.get(key)
+    if font is None:
+        if not _font_cache:
+            pygame.register_quit(_font_cache.clear)
+        font = _load_font(size, bold)
+        _font_cache[key] = font
+    return font
+
+
+def _load_font(size, bold):
     # macOS system font paths
     system_fonts = [
         "/Library/Fonts/Helvetica.ttc",  # Helvetica
@@ -76,8 +112,8 @@ def get_font(size, bold=True):
 
 
 def draw_rounded_rect(surface, color, rect, radius):
-    """Draw a rounded rectangle"""
-    pygame.draw.rect(surface, color, rect, border_radius=radius)
+    """Draw a rounded rectangle and return the area it covers"""
+    return pygame.draw.rect(surface, color, rect, border_radius=radius)
 
 
 def draw_grid(screen):
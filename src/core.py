@@ -0,0 +1,321 @@
+"""Headless game core.
+
+The game rules expressed over plain Python data, without touching pygame's
+display, mixer, font or clock. Snake, Food and Obstacle delegate their game
+logic to the functions below and only add rendering on top, while GameCore
+runs complete games on its own simulated clock for bots, tests and analytics.
+
+Functions that need randomness take an ``rng`` argument; both the ``random``
+module and a ``random.Random`` instance can be passed.
+"""
+
+import random
+from dataclasses import dataclass
+from .constants import (
+    GRID_WIDTH,
+    GRID_HEIGHT,
+    INITIAL_SPEED,
+    SPEED_INCREMENT,
+    LEVEL_POINTS,
+    MIN_SPEED,
+    MAX_SPEED,
+    OBSTACLE_COUNT,
+    FOOD_TYPES,
+    UP,
+    DOWN,
+    LEFT,
+    RIGHT,
+)
+from .grid import SnakeBody, FreeCells, CellSet
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+
+@dataclass
+class SpeedEffect:
+    """Timing of a temporary speed change."""
+
+    base_speed: int = INITIAL_SPEED  # Speed to restore when the effect ends
+    effect_end_time: int = 0  # Time in ms when the effect ends, 0 if none
+
+
+class SnakeState:
+    """Snake state without rendering. Snake adds rendering on top."""
+
+    def __init__(self, positions, direction, width=GRID_WIDTH, height=GRID_HEIGHT, free_cells=None):
+        self.width = width
+        self.height = height
+        self.free_cells = free_cells  # FreeCells index the body blocks, if any
+        self._body = None
+        self.positions = positions
+        self.direction = direction
+        self.length = 3
+        self.speed = INITIAL_SPEED
+        self.effects = SpeedEffect()
+
+    @property
+    def positions(self):
+        """Snake segments as a SnakeBody, head first."""
+        return self._body
+
+    @positions.setter
+    def positions(self, positions):
+        if self._body is not None:
+            self._body.release()
+        self._body = SnakeBody(positions, self.width, self.height, self.free_cells)
+
+    def get_head_position(self):
+        """Return the position of snake's head."""
+        return self._body[0]
+
+
+@dataclass
+class StepResult:
+    """Outcome of a single GameCore tick."""
+
+    game_over: bool = False
+    food_type: str = None  # Type of the food eaten this tick, if any
+
+
+def move(position, direction, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Return the cell one step from position, wrapping around the edges."""
+    return ((position[0] + direction[0]) % width, (position[1] + direction[1]) % height)
+
+
+def initial_positions(direction, length=3, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Return a body of the given length centred on the board, head first."""
+    center = (width // 2, height // 2)
+    dx, dy = direction
+    return [((center[0] - dx * i) % width, (center[1] - dy * i) % height) for i in range(length)]
+
+
+def is_reverse(direction, new_direction):
+    """Return True if new_direction would turn the snake back onto itself."""
+    return direction is not None and (direction[0] + new_direction[0], direction[1] + new_direction[1]) == (0, 0)
+
+
+def collision_cause(snake, new_pos, obstacle_positions):
+    """Return what moving the snake's head to new_pos runs into: "obstacle", "self" or None."""
+    if new_pos in obstacle_positions:
+        return "obstacle"
+    # Check collision with self (excluding the tail which will move)
+    body = snake.positions
+    if body.count(new_pos) > (len(body) > 0 and new_pos == body[-1]):
+        return "self"
+    return None
+
+
+def collides(snake, new_pos, obstacle_positions):
+    """Check if moving the snake's head to new_pos results in a collision."""
+    return collision_cause(snake, new_pos, obstacle_positions) is not None
+
+
+def expire_speed_effect(snake, now):
+    """Restore the base speed once a speed effect has run out."""
+    if snake.effects.effect_end_time > 0 and now >= snake.effects.effect_end_time:
+        snake.speed = snake.effects.base_speed
+        snake.effects.effect_end_time = 0
+
+
+def apply_food_effect(snake, food_properties, now):
+    """Apply the speed change of a food item to the snake."""
+    if food_properties["speed_change"] != 0:
+        snake.effects.base_speed = snake.speed  # Store current base speed
+        snake.speed += food_properties["speed_change"]
+        snake.speed = max(MIN_SPEED, min(snake.speed, MAX_SPEED))
+        if food_properties["duration"] > 0:
+            snake.effects.effect_end_time = now + food_properties["duration"]
+
+
+def eat_food(snake, food_properties, score, now, add_obstacle):
+    """Apply the rules for the snake eating a food item. Returns the new score.
+
+    The snake grows by the food's points and takes its speed effect. Every
+    LEVEL_POINTS points add_obstacle() is called to put a new obstacle on
+    the board and the snake speeds up.
+    """
+    snake.length += food_properties["points"]
+    score += food_properties["points"]
+    apply_food_effect(snake, food_properties, now)
+    if score % LEVEL_POINTS == 0:
+        add_obstacle()
+        snake.speed += SPEED_INCREMENT
+    return score
+
+
+def advance_snake(snake, obstacle_positions, now, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Move the snake one cell. Return True if the move collides."""
+    expire_speed_effect(snake, now)
+
+    new_head = move(snake.get_head_position(), snake.direction, width, height)
+    if collides(snake, new_head, obstacle_positions):
+        return True
+
+    body = snake.positions
+    body.push_head(new_head)
+    if len(body) > snake.length:
+        body.pop_tail()
+    return False
+
+
+def roll_food_type(rng=random):
+    """Pick a food type name using the spawn probabilities."""
+    rand = rng.random()
+    if rand < 0.60:
+        return "normal"
+    if rand < 0.75:
+        return "golden"
+    if rand < 0.875:
+        return "speed"
+    return "slow"
+
+
+def random_food_position(rng, free_cells):
+    """Get a uniformly random free position, or None if the board is full."""
+    return free_cells.choice(rng)
+
+
+def random_obstacles(rng, count, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Return count obstacle positions away from the board centre and edges."""
+    positions = set()
+    while len(positions) < count:
+        pos = (rng.randint(2, width - 3), rng.randint(2, height - 3))
+        # Ensure obstacles are not generated near the snake's initial position
+        if pos[0] < width // 2 - 2 or pos[0] > width // 2 + 2 or pos[1] < height // 2 - 2 or pos[1] > height // 2 + 2:
+            positions.add(pos)
+    return positions
+
+
+def danger_zone(head, direction, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Return the three cells in front of the head and their left and right neighbours."""
+    danger_positions = set()
+    x, y = head
+    dx, dy = direction
+    for _ in range(3):
+        x = (x + dx) % width
+        y = (y + dy) % height
+        danger_positions.add((x, y))
+        danger_positions.add(((x + dy) % width, (y - dx) % height))  # Left
+        danger_positions.add(((x - dy) % width, (y + dx) % height))  # Right
+    return danger_positions
+
+
+def place_obstacle(rng, snake, free_cells, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Pick a free cell for a new obstacle outside the snake's danger zone.
+
+    The danger zone is blocked in free_cells just for the draw, so this costs
+    O(|danger zone|) when the snake shares free_cells, plus O(len(snake)) when
+    it doesn't. Returns None only if no such cell exists.
+    """
+    reserved = danger_zone(snake.get_head_position(), snake.direction, width, height)
+    if snake.free_cells is not free_cells:
+        reserved.update(snake.positions)
+    for pos in reserved:
+        free_cells.block(pos)
+    try:
+        return free_cells.choice(rng)
+    finally:
+        for pos in reserved:
+            free_cells.unblock(pos)
+
+
+class GameCore:
+    """A complete game of snake on a simulated clock.
+
+    Each step advances the clock by one tick at the snake's current speed,
+    1000 / speed milliseconds as in the pygame loop's fixed timestep, and
+    applies the rules of ``snake_game.update_game_state``.
+    """
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, max_foods=3, seed=None):
+        self.width = width
+        self.height = height
+        self.max_foods = max_foods
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Start a new game."""
+        direction = self.rng.choice(DIRECTIONS)
+        self.free_cells = FreeCells(self.width, self.height)
+        self.snake = SnakeState(initial_positions(direction, 3, self.width, self.height), direction, self.width, self.height, self.free_cells)
+        self._obstacles = None
+        self._foods = {}
+        self.obstacles = random_obstacles(self.rng, OBSTACLE_COUNT, self.width, self.height)
+        self.score = 0
+        self.time = 0  # Simulated milliseconds since the start of the game
+        self.ticks = 0
+        self.game_over = False
+        self._spawn_foods()
+
+    @property
+    def obstacles(self):
+        """Obstacle positions as a CellSet blocking free_cells."""
+        return self._obstacles
+
+    @obstacles.setter
+    def obstacles(self, positions):
+        if positions is self._obstacles:
+            return  # In-place operators such as |= assign the set back to itself
+        # Read positions before releasing the old cells, in case it is derived from them
+        obstacles = CellSet(positions, self.free_cells)
+        if self._obstacles is not None:
+            self._obstacles.clear()
+        self._obstacles = obstacles
+
+    @property
+    def foods(self):
+        """Food position -> food type name, with every position blocking free_cells."""
+        return self._foods
+
+    @foods.setter
+    def foods(self, foods):
+        for pos in self._foods:
+            self.free_cells.unblock(pos)
+        self._foods = dict(foods)
+        for pos in self._foods:
+            self.free_cells.block(pos)
+
+    def _spawn_foods(self):
+        """Top the board up to max_foods food items, or as many as fit."""
+        while len(self.foods) < self.max_foods:
+            pos = random_food_position(self.rng, self.free_cells)
+            if pos is None:  # Board is full
+                return
+            self._foods[pos] = roll_food_type(self.rng)
+            self.free_cells.block(pos)
+
+    def turn(self, direction):
+        """Change direction unless it would reverse the snake."""
+        if not is_reverse(self.snake.direction, direction):
+            self.snake.direction = direction
+
+    def step(self, direction=None):
+        """Advance the game by one tick, optionally turning first."""
+        if self.game_over:
+            return StepResult(game_over=True)
+        if direction is not None:
+            self.turn(direction)
+
+        self.time += 1000 // self.snake.speed
+        self.ticks += 1
+
+        if advance_snake(self.snake, self.obstacles, self.time, self.width, self.height):
+            self.game_over = True
+            return StepResult(game_over=True)
+
+        head = self.snake.get_head_position()
+        type_name = self._foods.pop(head, None)
+        if type_name is None:
+            return StepResult()
+        self.free_cells.unblock(head)
+
+        self._spawn_foods()
+        self.score = eat_food(self.snake, FOOD_TYPES[type_name], self.score, self.time, self._add_obstacle)
+        return StepResult(food_type=type_name)
+
+    def _add_obstacle(self):
+        pos = place_obstacle(self.rng, self.snake, self.free_cells, self.width, self.height)
+        if pos is not None:
+            self.obstacles.add(pos)
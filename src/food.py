@@ -1,17 +1,69 @@
+import logging
 import random
+import threading
+from collections import Counter
 import pygame
 from pygame_emojis import load_emoji
 from .constants import (
     GRID_SIZE,
-    GRID_WIDTH,
-    GRID_HEIGHT,
     NORMAL_FOOD_COLOR,
     GOLDEN_APPLE_COLOR,
     SPEED_FRUIT_COLOR,
     SLOW_FRUIT_COLOR,
     FOOD_TYPES,
+    FOOD_EMOJIS,
+    EMOJI_SIZE,
 )
-from .particle_system import ParticleSystem
+from .core import roll_food_type, random_food_position
+from .particle_system import ParticleSystem, particle_atlas
+from .atlas import get_sprite, emoji_name
+from .profiler import profiler
+
+FOOD_COLORS = {
+    "normal": NORMAL_FOOD_COLOR,
+    "golden": GOLDEN_APPLE_COLOR,
+    "speed": SPEED_FRUIT_COLOR,
+    "slow": SLOW_FRUIT_COLOR,
+}
+
+_emoji_cache = {}
+
+
+def get_emoji(emoji, size=EMOJI_SIZE):
+    """Return the emoji surface at the given size, rasterizing it on first use."""
+    key = (emoji, tuple(size))
+    surface = _emoji_cache.get(key)
+    if surface is None:
+        if key[1] == EMOJI_SIZE:
+            surface = get_sprite(emoji_name(emoji))
+        if surface is None:
+            surface = load_emoji(emoji, key[1])
+        _emoji_cache[key] = surface
+    return surface
+
+
+def preload_emojis(size=EMOJI_SIZE, background=False):
+    """Rasterize every food emoji into the cache.
+
+    With background=True the work runs in a daemon thread, which is returned,
+    so it can overlap the start menu. Spawning food before it finishes just
+    loads the missing emoji itself.
+    """
+
+    def load_all():
+        for emojis in FOOD_EMOJIS.values():
+            for emoji in emojis:
+                try:
+                    get_emoji(emoji, size)
+                except Exception as e:
+                    logging.warning("Failed to preload emoji %s: %s", emoji, str(e))
+
+    if not background:
+        load_all()
+        return None
+    thread = threading.Thread(target=load_all, name="emoji-preload", daemon=True)
+    thread.start()
+    return thread
 
 
 class FoodItem:
@@ -26,7 +78,7 @@ class FoodItem:
         self.emoji_surface = emoji_surface
 
     def render(self, screen):
-        """Render food item on screen with both color and emoji."""
+        """Render food item on screen with both color and emoji, returning the area drawn."""
         # Draw colored background
         rect = pygame.Rect(
             self.position[0] * GRID_SIZE + 2,
@@ -34,99 +86,94 @@ class FoodItem:
             GRID_SIZE - 4,
             GRID_SIZE - 4,
         )
-        pygame.draw.rect(screen, self.color, rect, border_radius=10)
+        drawn = pygame.draw.rect(screen, self.color, rect, border_radius=10)
 
         # Draw emoji
         x = self.position[0] * GRID_SIZE + 2
         y = self.position[1] * GRID_SIZE + 2
-        screen.blit(self.emoji_surface, (x, y))
+        return drawn.union(screen.blit(self.emoji_surface, (x, y)))
 
 
 class Food:
     def __init__(self, obstacles, max_foods=3):
         """Initialize food manager with multiple food items."""
         self.obstacles = obstacles
+        self.free_cells = obstacles.free_cells
         self.max_foods = max_foods
-        self.foods = []  # List to store multiple food items
+        self._foods = []  # List to store multiple food items
+        self.eaten = Counter()  # Food type name -> number eaten by the snake
+        self.last_eaten = None  # Type of the food the snake ate last
 
-        # Define emoji for each food type
-        self.food_emojis = {
-            "normal": ["🍕", "🍇", "🍪", "🍓"],
-            "golden": ["🌟", "⭐", "🌞"],
-            "speed": ["⚡", "🚀", "💨"],
-            "slow": ["🐌", "🦥", "🐢"],
-        }
+        # Emoji for each food type
+        self.food_emojis = FOOD_EMOJIS
 
         # Initialize food items
         self._ensure_minimum_food()
 
-        # Initialize particle system
+        # Initialize particle system, with sprites for every food color baked up front
+        particle_atlas.prewarm(FOOD_COLORS.values())
         self.particle_system = ParticleSystem()
 
     def _create_food_item(self, position=None):
         """Create a new food item with random type at given or random position."""
         if position is None:
             position = self._get_random_position()
+            if position is None:  # Board is full
+                return None
 
         # Set random type based on probabilities
-        rand = random.random()
-        if rand < 0.60:
-            type_name = "normal"
-            color = NORMAL_FOOD_COLOR
-        elif rand < 0.75:
-            type_name = "golden"
-            color = GOLDEN_APPLE_COLOR
-        elif rand < 0.875:
-            type_name = "speed"
-            color = SPEED_FRUIT_COLOR
-        else:
-            type_name = "slow"
-            color = SLOW_FRUIT_COLOR
+        type_name = roll_food_type(random)
+        color = FOOD_COLORS[type_name]
 
         # Get effect properties and set emoji
         properties = FOOD_TYPES[type_name]
         emoji = random.choice(self.food_emojis[type_name])
-        emoji_surface = load_emoji(emoji, (GRID_SIZE - 4, GRID_SIZE - 4))
+        emoji_surface = get_emoji(emoji)
 
         return FoodItem(position, type_name, color, properties, emoji, emoji_surface)
 
     def _get_random_position(self):
-        """Get a random position that doesn't overlap with obstacles, other food, or previous positions."""
-        attempts = 0
-        max_attempts = 100  # Prevent infinite loop
-        previous_positions = {food.position for food in self.foods}
-
-        while attempts < max_attempts:
-            x = random.randint(0, GRID_WIDTH - 1)
-            y = random.randint(0, GRID_HEIGHT - 1)
-            pos = (x, y)
-
-            # Check if position is valid and not in previous positions
-            if pos not in self.obstacles.positions and pos not in previous_positions:
-                return pos
-            attempts += 1
-
-        # If we couldn't find a new position after max attempts,
-        # just return any valid position
-        while True:
-            x = random.randint(0, GRID_WIDTH - 1)
-            y = random.randint(0, GRID_HEIGHT - 1)
-            pos = (x, y)
-            if pos not in self.obstacles.positions:
-                return pos
+        """Get a uniformly random free position, or None if the board is full."""
+        return random_food_position(random, self.free_cells)
+
+    @property
+    def foods(self):
+        """Food items on the board, kept in step with the free-cell index."""
+        return self._foods
+
+    @foods.setter
+    def foods(self, foods):
+        for food in self._foods:
+            self.free_cells.unblock(food.position)
+        self._foods = list(foods)
+        for food in self._foods:
+            self.free_cells.block(food.position)
+
+    def _add_food(self, food):
+        """Put a food item on the board."""
+        self._foods.append(food)
+        self.free_cells.block(food.position)
+
+    def _pop_food(self, index):
+        """Take the food item at index off the board and return it."""
+        food = self._foods.pop(index)
+        self.free_cells.unblock(food.position)
+        return food
 
     def _ensure_minimum_food(self):
-        """Ensure there is always at least one food item."""
-        while len(self.foods) < self.max_foods:
-            self.foods.append(self._create_food_item())
+        """Ensure there are max_foods food items, or as many as the board fits."""
+        while len(self._foods) < self.max_foods:
+            food = self._create_food_item()
+            if food is None:  # Board is full
+                return
+            self._add_food(food)
 
     def remove_food(self, position):
         """Remove food at given position and return its properties."""
-        for i, food in enumerate(self.foods):
+        for i, food in enumerate(self._foods):
             if food.position == position:
-                properties = food.properties
-                self.foods.pop(i)
-                self.foods.append(self._create_food_item())
+                properties = self._pop_food(i).properties
+                self._ensure_minimum_food()
                 return properties
         return None
 
@@ -136,14 +183,16 @@ class Food:
         return [food.position for food in self.foods]
 
     def render(self, screen):
-        """Render all food items and particles."""
+        """Render all food items and particles, returning the areas drawn."""
         # Update and render particles
-        self.particle_system.update()
-        self.particle_system.render(screen)
+        with profiler.span("particles"):
+            self.particle_system.update()
+            rects = self.particle_system.render(screen)
 
         # Render food items
         for food in self.foods:
-            food.render(screen)
+            rects.append(food.render(screen))
+        return rects
 
     def check_collision(self, pos):
         """Check if snake collided with any food item."""
@@ -161,10 +210,11 @@ class Food:
                     particle_count = 25  # Medium amount for speed food
 
                 self.particle_system.emit(x, y, food.color, count=particle_count)
+                self.eaten[food.type] += 1
+                self.last_eaten = food.type
 
                 # Remove eaten food and return its properties
-                properties = food.properties
-                self.foods.pop(i)
+                properties = self._pop_food(i).properties
                 self._ensure_minimum_food()
                 return properties
         return None
@@ -1,11 +1,15 @@
 import logging
+import os
 import pygame
 
 
 class GameState:
+    high_score_file = "high_score.txt"
+
     def __init__(self):
         self.score = 0
         self.high_score = self.load_high_score()
+        self.high_score_dirty = False  # High score changed since it was last saved
         self.start_time = 0
         self.is_game_over = False
         self.is_playing = False
@@ -14,7 +18,7 @@ class GameState:
     def load_high_score(self):
         """Load the high score from file."""
         try:
-            with open("high_score.txt", "r", encoding="utf-8") as f:
+            with open(self.high_score_file, "r", encoding="utf-8") as f:
                 return int(f.read())
         except FileNotFoundError:
             return 0
@@ -22,19 +26,41 @@ class GameState:
             return 0
 
     def save_high_score(self):
-        """Save the current high score to file."""
+        """Save the current high score to file.
+
+        The score is written to a temporary file that then replaces the old
+        one, so an interrupted save never leaves a truncated file behind.
+        """
+        temp_file = self.high_score_file + ".tmp"
         try:
-            with open("high_score.txt", "w", encoding="utf-8") as f:
+            with open(temp_file, "w", encoding="utf-8") as f:
                 f.write(str(self.high_score))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.high_score_file)
+            self.high_score_dirty = False
         except (IOError, PermissionError) as e:
             logging.error("Failed to save high score: %s", str(e))
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+    def flush_high_score(self):
+        """Save the high score if it changed since the last save."""
+        if self.high_score_dirty:
+            self.save_high_score()
 
     def update_score(self, new_score):
-        """Update the current score and high score if necessary."""
+        """Update the current score and high score if necessary.
+
+        A new high score is only saved when the game ends or the player
+        quits, so scoring never waits on the disk.
+        """
         self.score = new_score
         if self.score > self.high_score:
             self.high_score = self.score
-            self.save_high_score()
+            self.high_score_dirty = True
 
     def start_game(self):
         """Start a new game."""
@@ -51,7 +77,8 @@ class GameState:
         self.is_paused = False
         if self.score > self.high_score:
             self.high_score = self.score
-            self.save_high_score()
+            self.high_score_dirty = True
+        self.flush_high_score()
 
     def toggle_pause(self):
         """Toggle the game's pause state."""
@@ -0,0 +1,264 @@
+"""Board bookkeeping structures shared by the game core and the sprites.
+
+Cells are (x, y) tuples. Everything here is plain Python with O(1) updates,
+so the snake, obstacles and food can keep each other informed every tick.
+"""
+
+from collections.abc import Set
+from itertools import chain
+from .constants import GRID_WIDTH, GRID_HEIGHT
+
+
+class FreeCells:
+    """Cells not taken by the snake, obstacles or food.
+
+    Free cells are kept in an array with a position -> index map, and a cell
+    is removed by swapping it with the last entry, so blocking, unblocking and
+    uniform sampling are all O(1). Each cell counts its blockers, which lets
+    the snake, obstacles and food share one index without knowing about each
+    other. Positions off the board are ignored.
+    """
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        self._cells = [(x, y) for y in range(height) for x in range(width)]
+        self._index = {pos: i for i, pos in enumerate(self._cells)}
+        self._blockers = bytearray(width * height)
+
+    def _blocker_slot(self, position):
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    def block(self, position):
+        """Mark position as taken by one more thing."""
+        slot = self._blocker_slot(position)
+        if slot is None:
+            return
+        self._blockers[slot] += 1
+        if self._blockers[slot] == 1:
+            # Swap-remove from the free array
+            index = self._index.pop(position)
+            last = self._cells.pop()
+            if index < len(self._cells):
+                self._cells[index] = last
+                self._index[last] = index
+
+    def unblock(self, position):
+        """Release one blocker from position, freeing it when none are left."""
+        slot = self._blocker_slot(position)
+        if slot is None or self._blockers[slot] == 0:
+            return
+        self._blockers[slot] -= 1
+        if self._blockers[slot] == 0:
+            self._index[position] = len(self._cells)
+            self._cells.append(position)
+
+    def choice(self, rng):
+        """Return a uniformly random free cell, or None if the board is full."""
+        if not self._cells:
+            return None
+        return self._cells[rng.randrange(len(self._cells))]
+
+    def __contains__(self, position):
+        return position in self._index
+
+    def __len__(self):
+        return len(self._cells)
+
+
+class CellSet(set):
+    """A set of positions that blocks its cells in a FreeCells index.
+
+    Every change, whether through add, discard, remove, pop, clear, the
+    *_update methods or the in-place operators, is passed on to the index,
+    and each one bumps version so caches built from the set can tell when it
+    changed.
+    """
+
+    def __init__(self, positions=(), free_cells=None):
+        super().__init__()
+        self.free_cells = free_cells
+        self.version = 0
+        self.update(positions)
+
+    def add(self, position):
+        if position not in self:
+            super().add(position)
+            self.version += 1
+            if self.free_cells is not None:
+                self.free_cells.block(position)
+
+    def discard(self, position):
+        if position in self:
+            super().discard(position)
+            self.version += 1
+            if self.free_cells is not None:
+                self.free_cells.unblock(position)
+
+    def remove(self, position):
+        if position not in self:
+            raise KeyError(position)
+        self.discard(position)
+
+    def pop(self):
+        position = super().pop()
+        self.version += 1
+        if self.free_cells is not None:
+            self.free_cells.unblock(position)
+        return position
+
+    def update(self, *others):
+        for positions in others:
+            for position in positions:
+                self.add(position)
+
+    def difference_update(self, *others):
+        for positions in others:
+            for position in list(positions):  # Copied, as positions may be this set
+                self.discard(position)
+
+    def intersection_update(self, *others):
+        keep = set(self).intersection(*others)
+        for position in [position for position in self if position not in keep]:
+            self.discard(position)
+
+    def symmetric_difference_update(self, other):
+        for position in set(other):
+            if position in self:
+                self.discard(position)
+            else:
+                self.add(position)
+
+    def clear(self):
+        while self:
+            self.pop()
+
+    def __ior__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        if not isinstance(other, Set):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
+
+class SnakeBody:
+    """Snake segments, head first, with a per-cell occupancy count.
+
+    Segments live in a ring buffer with room for every cell on the board, so
+    pushing the head and popping the tail are O(1) and memory stays flat as
+    the snake grows. The occupancy counts are updated only on those two
+    operations, so testing whether a cell is part of the body is constant-time
+    too. When given a FreeCells index, the body blocks the cells it covers.
+    Supports the read-only list operations the game uses (indexing,
+    slicing, len, iteration, ``in`` and comparison with a list).
+    """
+
+    def __init__(self, positions=(), width=GRID_WIDTH, height=GRID_HEIGHT, free_cells=None):
+        positions = list(positions)
+        self.width = width
+        self.height = height
+        self.free_cells = free_cells
+        self.capacity = max(width * height, len(positions))
+        self.occupancy = bytearray(width * height)
+        self._slots = positions + [None] * (self.capacity - len(positions))
+        self._head = 0  # Slot holding the head
+        self._size = len(positions)
+        self.pushed = 0  # Heads pushed so far; the segment at index i was pushed as number pushed - i
+        for x, y in positions:
+            self.occupancy[y * width + x] += 1
+            if free_cells is not None:
+                free_cells.block((x, y))
+
+    def push_head(self, position):
+        """Add a new head segment."""
+        if self._size == self.capacity:
+            self._grow()
+        self._head = (self._head - 1) % self.capacity
+        self._slots[self._head] = position
+        self._size += 1
+        self.pushed += 1
+        self.occupancy[position[1] * self.width + position[0]] += 1
+        if self.free_cells is not None:
+            self.free_cells.block(position)
+
+    def pop_tail(self):
+        """Remove and return the tail segment."""
+        if not self._size:
+            raise IndexError("pop from empty snake body")
+        index = (self._head + self._size - 1) % self.capacity
+        x, y = self._slots[index]
+        self._slots[index] = None
+        self._size -= 1
+        self.occupancy[y * self.width + x] -= 1
+        if self.free_cells is not None:
+            self.free_cells.unblock((x, y))
+        return (x, y)
+
+    def release(self):
+        """Give every segment's cell back to the free-cell index."""
+        if self.free_cells is not None:
+            for position in self:
+                self.free_cells.unblock(position)
+            self.free_cells = None
+
+    def _grow(self):
+        """Double the capacity; only needed when segments overlap on a full board."""
+        self._slots = list(self) + [None] * self.capacity
+        self.capacity *= 2
+        self._head = 0
+
+    def count(self, position):
+        """Return how many segments are on position."""
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.occupancy[y * self.width + x]
+        return 0
+
+    def __contains__(self, position):
+        return self.count(position) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("snake body index out of range")
+        return self._slots[(self._head + index) % self.capacity]
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        end = self._head + self._size
+        if end <= self.capacity:
+            return iter(self._slots[self._head : end])
+        return chain(self._slots[self._head :], self._slots[: end - self.capacity])
+
+    def __eq__(self, other):
+        if not isinstance(other, (SnakeBody, list, tuple)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"SnakeBody({list(self)!r})"
@@ -0,0 +1,107 @@
+"""Local history of every run, kept in SQLite.
+
+Each finished game becomes one row in ``runs`` plus a row per food type in
+``run_food``, written together in a single transaction. The database runs
+in WAL mode so a reporting process can read it while games are being played.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    score INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    max_length INTEGER NOT NULL,
+    death_cause TEXT,
+    seed INTEGER
+);
+CREATE TABLE IF NOT EXISTS run_food (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    food_type TEXT NOT NULL,
+    eaten INTEGER NOT NULL,
+    PRIMARY KEY (run_id, food_type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, duration_ms);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (played_at);
+"""
+
+
+@dataclass
+class Run:
+    """Summary of one finished game."""
+
+    score: int
+    duration_ms: int
+    max_length: int
+    death_cause: str = None  # "obstacle" or "self", if the snake crashed
+    seed: int = None  # Seed the game's random number generator started from
+    food_eaten: dict = field(default_factory=dict)  # Food type name -> number eaten
+    played_at: float = field(default_factory=time.time)  # Unix time the game ended
+
+
+class RunHistory:
+    def __init__(self, path="runs.db"):
+        """Open or create the run history database at path."""
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, and commits skip an fsync
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(_SCHEMA)
+
+    def record_runs(self, runs):
+        """Store runs in one transaction. Returns False if they couldn't be saved."""
+        try:
+            with self.connection:
+                for run in runs:
+                    cursor = self.connection.execute(
+                        "INSERT INTO runs (played_at, score, duration_ms, max_length, death_cause, seed) VALUES (?, ?, ?, ?, ?, ?)",
+                        (run.played_at, run.score, run.duration_ms, run.max_length, run.death_cause, run.seed),
+                    )
+                    self.connection.executemany(
+                        "INSERT INTO run_food (run_id, food_type, eaten) VALUES (?, ?, ?)",
+                        [(cursor.lastrowid, food_type, eaten) for food_type, eaten in run.food_eaten.items() if eaten],
+                    )
+        except sqlite3.Error as e:
+            logging.error("Failed to save run history: %s", str(e))
+            return False
+        return True
+
+    def record_run(self, run):
+        """Store a single run."""
+        return self.record_runs([run])
+
+    def top_runs(self, limit=10):
+        """Return the best runs by score, quickest first among equal scores."""
+        rows = self.connection.execute(
+            "SELECT id, played_at, score, duration_ms, max_length, death_cause, seed FROM runs ORDER BY score DESC, duration_ms LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return self._with_food(rows)
+
+    def recent_runs(self, limit=10):
+        """Return the most recently finished runs, newest first."""
+        rows = self.connection.execute(
+            "SELECT id, played_at, score, duration_ms, max_length, death_cause, seed FROM runs ORDER BY played_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return self._with_food(rows)
+
+    def _with_food(self, rows):
+        """Build Runs from runs rows, loading their food counts in one query."""
+        food_eaten = {row[0]: {} for row in rows}
+        if food_eaten:
+            placeholders = ", ".join("?" * len(food_eaten))
+            for run_id, food_type, eaten in self.connection.execute(f"SELECT run_id, food_type, eaten FROM run_food WHERE run_id IN ({placeholders})", list(food_eaten)):
+                food_eaten[run_id][food_type] = eaten
+        return [
+            Run(score=score, duration_ms=duration_ms, max_length=max_length, death_cause=death_cause, seed=seed, food_eaten=food_eaten[run_id], played_at=played_at)
+            for run_id, played_at, score, duration_ms, max_length, death_cause, seed in rows
+        ]
+
+    def close(self):
+        self.connection.close()
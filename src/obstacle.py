@@ -1,71 +1,92 @@
+import logging
 import random
+import weakref
 import pygame
 from .constants import (
-    GRID_WIDTH,
-    GRID_HEIGHT,
     OBSTACLE_COLOR,
     GRID_SIZE,
+    GRID_WIDTH,
+    GRID_HEIGHT,
     OBSTACLE_COUNT,
-    draw_rounded_rect,
 )
+from .atlas import get_tile
+from .core import random_obstacles, place_obstacle
+from .grid import FreeCells, CellSet
 
 
 class Obstacle:
-    def __init__(self):
-        self.positions = set()
+    def __init__(self, free_cells=None):
+        # Free-cell index for the board, shared with the snake and food
+        self.free_cells = free_cells if free_cells is not None else FreeCells()
+        self._positions = CellSet(free_cells=self.free_cells)
         self.color = OBSTACLE_COLOR
         self.generate_obstacles(OBSTACLE_COUNT)  # Initial number of obstacles
 
+        # Obstacles pre-drawn onto layers, rebuilt only when the positions or color change
+        self._layer = None  # Transparent layer for render
+        self._layer_rects = []  # Areas the obstacles cover on the layer
+        self._layer_key = None
+        self._composites = weakref.WeakKeyDictionary()  # Background -> (key, copy with obstacles)
+
+    @property
+    def positions(self):
+        """Obstacle positions, kept in step with the free-cell index."""
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions):
+        if positions is self._positions:
+            return  # In-place operators such as |= assign the set back to itself
+        positions = list(positions)  # Read before clearing, in case it is derived from the current set
+        self._positions.clear()
+        self._positions.update(positions)
+
     def generate_obstacles(self, count):
         """Generate specified number of obstacles"""
         self.positions.clear()
-        while len(self.positions) < count:
-            pos = (
-                random.randint(2, GRID_WIDTH - 3),
-                random.randint(2, GRID_HEIGHT - 3),
-            )
-            # Ensure obstacles are not generated near the snake's initial position
-            if pos[0] < GRID_WIDTH // 2 - 2 or pos[0] > GRID_WIDTH // 2 + 2 or pos[1] < GRID_HEIGHT // 2 - 2 or pos[1] > GRID_HEIGHT // 2 + 2:
-                self.positions.add(pos)
+        self.positions.update(random_obstacles(random, count))
 
     def add_obstacle(self, snake):
-        """Add a new obstacle, avoiding placement directly in front of the snake"""
-        head = snake.get_head_position()
-        direction = snake.direction
+        """Add a new obstacle, avoiding placement directly in front of the snake.
+
+        Returns the new obstacle's position, or None if the board has no room.
+        """
+        pos = place_obstacle(random, snake, self.free_cells)
+        if pos is None:
+            logging.warning("No free cell left for a new obstacle")
+            return None
+        self.positions.add(pos)
+        return pos
 
-        # Calculate the three grid cells in front of the snake's head
-        danger_positions = set()
-        x, y = head
-        dx, dy = direction
-        for _ in range(3):  # Check the three cells in front
-            x = (x + dx) % GRID_WIDTH
-            y = (y + dy) % GRID_HEIGHT
-            danger_positions.add((x, y))
-            # Add the cells to the left and right
-            danger_positions.add(((x + dy) % GRID_WIDTH, (y - dx) % GRID_HEIGHT))  # Left
-            danger_positions.add(((x - dy) % GRID_WIDTH, (y + dx) % GRID_HEIGHT))  # Right
+    def _draw(self, surface):
+        """Draw every obstacle onto surface and return the areas drawn"""
+        tile = get_tile(self.color)
+        return [surface.blit(tile, (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE)) for pos in self.positions]
 
-        # Try to place a new obstacle
-        attempts = 100  # Maximum attempts
-        while attempts > 0:
-            pos = (
-                random.randint(0, GRID_WIDTH - 1),
-                random.randint(0, GRID_HEIGHT - 1),
-            )
+    def composite(self, background):
+        """Return a copy of background with the obstacles drawn on.
 
-            # Check if the position meets all conditions
-            if pos not in snake.positions and pos not in self.positions and pos not in danger_positions:
-                self.positions.add(pos)
-                break
-            attempts -= 1
+        The copy is kept and only redrawn when the obstacles change, so a
+        renderer can use it as its backdrop and skip drawing obstacles per
+        frame. A new surface is returned whenever the obstacles changed.
+        """
+        key = (self._positions.version, self.color)
+        cached = self._composites.get(background)
+        if cached is None or cached[0] != key:
+            cached = (key, background.copy())
+            self._draw(cached[1])
+            self._composites[background] = cached
+        return cached[1]
 
     def render(self, screen):
-        """Render all obstacles on the screen"""
-        for pos in self.positions:
-            rect = pygame.Rect(
-                pos[0] * GRID_SIZE + 2,
-                pos[1] * GRID_SIZE + 2,
-                GRID_SIZE - 4,
-                GRID_SIZE - 4,
-            )
-            draw_rounded_rect(screen, self.color, rect, 10)
+        """Render all obstacles on the screen with a single blit and return the areas drawn"""
+        key = (self._positions.version, self.color)
+        if self._layer_key != key:
+            self._layer = pygame.Surface((GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE), pygame.SRCALPHA)
+            self._layer_rects = self._draw(self._layer)
+            self._layer_key = key
+        if not self._layer_rects:
+            return []
+        bounds = self._layer_rects[0].unionall(self._layer_rects)
+        screen.blit(self._layer, bounds, bounds)
+        return list(self._layer_rects)
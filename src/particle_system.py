@@ -1,80 +1,212 @@
 import math
-import random
-from dataclasses import dataclass
+import numpy as np
 import pygame
 
+PARTICLE_SIZES = range(3, 7)  # Particle radii in pixels
+ALPHA_LEVELS = 16  # Quantized alpha steps baked per color and size
+STEP_RATE = 6  # Physics steps per second the velocities, drag and gravity are tuned for
 
-@dataclass
-class ParticleVisuals:
-    """Visual properties of a particle."""
 
-    color: tuple[int, int, int]
-    alpha: int = 255
-    size: int = 0
+class ParticleAtlas:
+    """Circle sprites for every particle size and alpha level, baked once per color."""
 
-    def __post_init__(self):
-        if self.size == 0:
-            self.size = random.randint(3, 6)
+    def __init__(self):
+        self._tables = {}  # color -> sprites indexed [size][alpha level]
 
+    def sprites(self, color):
+        """Return the sprite table for a color, baking it on first use."""
+        color = tuple(color)
+        table = self._tables.get(color)
+        if table is None:
+            table = {}
+            for size in PARTICLE_SIZES:
+                table[size] = []
+                for level in range(ALPHA_LEVELS):
+                    sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(sprite, (*color, level * 255 // (ALPHA_LEVELS - 1)), (size, size), size)
+                    table[size].append(sprite)
+            self._tables[color] = table
+        return table
 
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime=1.0):
-        # Essential attributes for physics/movement
-        self.x = x
-        self.y = y
-        self.velocity = velocity
-        self.lifetime = lifetime
-        self.birth_time = pygame.time.get_ticks()
+    def prewarm(self, colors):
+        """Bake the sprites for colors ahead of time."""
+        for color in colors:
+            self.sprites(color)
 
-        # Visual properties grouped in dataclass
-        self.visuals = ParticleVisuals(color=color)
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        age = (current_time - self.birth_time) / 1000.0  # Convert to seconds
-        if age > self.lifetime:
-            return False
+particle_atlas = ParticleAtlas()
 
-        # Update position with gravity effect
-        self.velocity = (
-            self.velocity[0] * 0.98,  # Horizontal drag
-            self.velocity[1] + 0.1,  # Gravity
-        )
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
 
-        # Fade out
-        self.visuals.alpha = int(255 * (1 - age / self.lifetime))
-        return True
+def _particle_field(name):
+    """Property reading and writing one particle's entry in a system array."""
 
-    def render(self, screen):
-        if self.visuals.alpha <= 0:
-            return
+    def get(self):
+        return getattr(self.system, name)[self.index].item()
+
+    def set_value(self, value):
+        getattr(self.system, name)[self.index] = value
+
+    return property(get, set_value)
+
+
+class Particle:
+    """A view of one particle stored in a ParticleSystem's arrays.
 
-        surface = pygame.Surface((self.visuals.size * 2, self.visuals.size * 2), pygame.SRCALPHA)
-        color_with_alpha = (*self.visuals.color, self.visuals.alpha)
-        pygame.draw.circle(surface, color_with_alpha, (self.visuals.size, self.visuals.size), self.visuals.size)
-        screen.blit(surface, (int(self.x - self.visuals.size), int(self.y - self.visuals.size)))
+    Views are only valid until the next update, which compacts the arrays.
+    """
+
+    __slots__ = ("system", "index")
+
+    def __init__(self, system, index):
+        self.system = system
+        self.index = index
+
+    x = _particle_field("x")
+    y = _particle_field("y")
+    birth_time = _particle_field("birth_time")
+    lifetime = _particle_field("lifetime")
+    size = _particle_field("size")
+    alpha = _particle_field("alpha")
 
 
 class ParticleSystem:
+    """Particles stored as parallel NumPy arrays.
+
+    Each field lives in its own array with the live particles packed at the
+    front, so a frame's physics is one vectorised pass and dead particles are
+    dropped by compacting the arrays. Each update scales the physics by the
+    time since the last one, so particles move the same at any frame rate. Particles are drawn in one batched
+    blit from the shared particle_atlas, with alpha quantized to its levels.
+    """
+
+    initial_capacity = 64
+
     def __init__(self):
-        self.particles = []
+        self.count = 0
+        self.capacity = self.initial_capacity
+        self.x = np.zeros(self.capacity, dtype=np.float64)
+        self.y = np.zeros(self.capacity, dtype=np.float64)
+        self.vx = np.zeros(self.capacity, dtype=np.float64)
+        self.vy = np.zeros(self.capacity, dtype=np.float64)
+        self.birth_time = np.zeros(self.capacity, dtype=np.int64)  # Ticks when emitted
+        self.lifetime = np.zeros(self.capacity, dtype=np.float64)  # Seconds
+        self.color = np.zeros(self.capacity, dtype=np.int64)  # Index into palette
+        self.size = np.zeros(self.capacity, dtype=np.int64)
+        self.alpha = np.zeros(self.capacity, dtype=np.int64)
+        self.palette = []  # Colors referenced by index from the color array
+        self._palette_sprites = []  # Atlas sprite table for each palette color
+        self._rng = np.random.default_rng()
+        self._updated_at = None  # Ticks at the last update
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def particles(self):
+        """Views of the live particles."""
+        return [Particle(self, i) for i in range(self.count)]
+
+    def _arrays(self):
+        """Every per-particle array."""
+        return (self.x, self.y, self.vx, self.vy, self.birth_time, self.lifetime, self.color, self.size, self.alpha)
+
+    def _grown(self, array):
+        """Copy of array's live entries in an array of the current capacity."""
+        grown = np.zeros(self.capacity, dtype=array.dtype)
+        grown[: self.count] = array[: self.count]
+        return grown
+
+    def _reserve(self, count):
+        """Grow the arrays so count more particles fit."""
+        if self.count + count <= self.capacity:
+            return
+        while self.capacity < self.count + count:
+            self.capacity *= 2
+        self.x = self._grown(self.x)
+        self.y = self._grown(self.y)
+        self.vx = self._grown(self.vx)
+        self.vy = self._grown(self.vy)
+        self.birth_time = self._grown(self.birth_time)
+        self.lifetime = self._grown(self.lifetime)
+        self.color = self._grown(self.color)
+        self.size = self._grown(self.size)
+        self.alpha = self._grown(self.alpha)
+
+    def _color_index(self, color):
+        color = tuple(color)
+        if color not in self.palette:
+            self.palette.append(color)
+            self._palette_sprites.append(particle_atlas.sprites(color))
+        return self.palette.index(color)
 
     def emit(self, x, y, color, count=10):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)  # Increased speed range
-            velocity = (
-                math.cos(angle) * speed,
-                math.sin(angle) * speed - 2,
-            )  # Initial upward velocity
-            lifetime = random.uniform(0.8, 1.2)  # Slightly longer lifetime
-            self.particles.append(Particle(x, y, color, velocity, lifetime))
+        self._reserve(count)
+        new = slice(self.count, self.count + count)
+        angle = self._rng.uniform(0, 2 * math.pi, count)
+        speed = self._rng.uniform(2, 5, count)  # Increased speed range
+        self.x[new] = x
+        self.y[new] = y
+        self.vx[new] = np.cos(angle) * speed
+        self.vy[new] = np.sin(angle) * speed - 2  # Initial upward velocity
+        self.birth_time[new] = pygame.time.get_ticks()
+        self.lifetime[new] = self._rng.uniform(0.8, 1.2, count)  # Slightly longer lifetime
+        self.color[new] = self._color_index(color)
+        self.size[new] = self._rng.integers(3, 7, count)
+        self.alpha[new] = 255
+        self.count += count
 
     def update(self):
-        self.particles = [p for p in self.particles if p.update()]
+        if not self.count:
+            return
+        now = pygame.time.get_ticks()
+        live = slice(0, self.count)
+        age = (now - self.birth_time[live]) / 1000.0  # Convert to seconds
+        alive = age <= self.lifetime[live]
+
+        # Compact the survivors to the front of every array
+        if not alive.all():
+            kept = int(alive.sum())
+            for array in self._arrays():
+                array[:kept] = array[live][alive]
+            age = age[alive]
+            self.count = kept
+            live = slice(0, kept)
+
+        # Steps of physics since the last update, or since birth for newer particles
+        elapsed = age if self._updated_at is None else np.minimum(age, (now - self._updated_at) / 1000.0)
+        self._updated_at = now
+        steps = elapsed * STEP_RATE
+
+        # Update position with gravity effect
+        self.vx[live] *= 0.98**steps  # Horizontal drag
+        self.vy[live] += 0.1 * steps  # Gravity
+        self.x[live] += self.vx[live] * steps
+        self.y[live] += self.vy[live] * steps
+
+        # Fade out
+        self.alpha[live] = (255 * (1 - age / self.lifetime[live])).astype(np.int64)
+
+    def bounds(self):
+        """Smallest rect covering every live particle's sprite, or None if there are none."""
+        if not self.count:
+            return None
+        live = slice(0, self.count)
+        left = (self.x[live] - self.size[live]).astype(np.int64)
+        top = (self.y[live] - self.size[live]).astype(np.int64)
+        x, y = int(left.min()), int(top.min())
+        return pygame.Rect(x, y, int((left + 2 * self.size[live]).max()) - x, int((top + 2 * self.size[live]).max()) - y)
 
     def render(self, screen):
-        for particle in self.particles:
-            particle.render(screen)
+        """Draw all particles and return the areas they cover."""
+        if not self.count:
+            return []
+        live = slice(0, self.count)
+        level = (self.alpha[live] * (ALPHA_LEVELS - 1) + 127) // 255
+        visible = level > 0
+        left = (self.x[live] - self.size[live]).astype(np.int64)[visible]
+        top = (self.y[live] - self.size[live]).astype(np.int64)[visible]
+        sprites = self._palette_sprites
+        blit_sequence = [
+            (sprites[color_index][size][alpha_level], (x, y)) for color_index, size, alpha_level, x, y in zip(self.color[live][visible].tolist(), self.size[live][visible].tolist(), level[visible].tolist(), left.tolist(), top.tolist())
+        ]
+        return screen.blits(blit_sequence, doreturn=True)
@@ -0,0 +1,92 @@
+"""Per-subsystem frame timing.
+
+Code marks the work it wants measured with ``profiler.span(name)``. Time
+spent in each named span is summed over a frame, and the last ``window``
+frames' sums are kept so their percentiles can be read at any time. Spans
+may nest; an inner span's time also counts towards the outer one.
+
+While the profiler is disabled, span() returns a shared do-nothing context
+manager, so instrumented code costs little more than the call.
+"""
+
+import contextlib
+import time
+from collections import deque
+
+_DISABLED = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("totals", "name", "start")
+
+    def __init__(self, totals, name):
+        self.totals = totals
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.totals[self.name] = self.totals.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of already sorted values."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class FrameProfiler:
+    def __init__(self, window=240):
+        """Keep per-frame span times for the last window frames, 4 seconds at 60 FPS."""
+        self.window = window
+        self.enabled = False
+        self._frame_totals = {}  # Span name -> seconds spent in it this frame
+        self._frame_start = None
+        self._samples = {}  # Span name -> deque of per-frame milliseconds, oldest first
+
+    def span(self, name):
+        """Context manager timing the code it wraps as part of name."""
+        if not self.enabled:
+            return _DISABLED
+        return _Span(self._frame_totals, name)
+
+    def toggle(self):
+        """Turn profiling on or off, starting over from no samples."""
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self):
+        self._frame_totals.clear()
+        self._frame_start = None
+        self._samples.clear()
+
+    def begin_frame(self):
+        """Mark the start of a frame, whose whole duration is recorded as "frame"."""
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Record this frame's span times. Spans that didn't run this frame record zero."""
+        if not self.enabled:
+            return
+        totals = self._frame_totals
+        if self._frame_start is not None:
+            totals["frame"] = time.perf_counter() - self._frame_start
+            self._frame_start = None
+        for name in totals.keys() - self._samples.keys():
+            self._samples[name] = deque(maxlen=self.window)
+        for name, samples in self._samples.items():
+            samples.append(totals.get(name, 0.0) * 1000)
+        totals.clear()
+
+    def percentiles(self):
+        """Span name -> (p50, p95, p99) in milliseconds over the window."""
+        report = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            report[name] = (percentile(ordered, 0.5), percentile(ordered, 0.95), percentile(ordered, 0.99))
+        return report
+
+
+profiler = FrameProfiler()  # Shared by the game loop and everything it draws
@@ -0,0 +1,128 @@
+"""Gameplay recording through a shared-memory ring and an encoder process.
+
+FrameRecorder copies each rendered frame into the next free slot of a ring
+of frame buffers in shared memory and signals an encoder process, which
+writes the frames out as a PNG sequence or as raw RGB. Capturing only costs
+a pixel copy; when the encoder falls behind and the ring is full, frames are
+dropped rather than stalling the game, and counted in the recorder's stats.
+"""
+
+import contextlib
+import ctypes
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import pygame
+from .ui import encode_png
+
+RECORD_FORMATS = ("png", "raw")
+PARENT_CHECK_SECONDS = 0.5  # How often an idle encoder checks the game is still running
+
+
+def _encode_frames(ring, frame_bytes, slots, size, directory, record_format, filled, free, stop_after, encoded):
+    """Encoder process: write each filled slot out in order until stop_after frames are done.
+
+    Also stops if the game process goes away without closing the recorder.
+    """
+    # Forked after pygame.init(), so undo SDL's signal handlers and let signals end the encoder
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    parent = multiprocessing.parent_process()
+    buffer = memoryview(ring).cast("B")
+    with open(os.path.join(directory, "frames.rgb"), "wb") if record_format == "raw" else contextlib.nullcontext() as raw_file:
+        while True:
+            if not filled.acquire(timeout=PARENT_CHECK_SECONDS):
+                if parent is not None and not parent.is_alive():
+                    break
+                continue
+            if 0 <= stop_after.value <= encoded.value:
+                break
+            slot = encoded.value % slots
+            frame = bytes(buffer[slot * frame_bytes : (slot + 1) * frame_bytes])
+            free.release()  # The slot can take a new frame while this one is written
+            if raw_file is not None:
+                raw_file.write(frame)
+            else:
+                with open(os.path.join(directory, f"frame_{encoded.value:06d}.png"), "wb") as f:
+                    f.write(encode_png(frame, size, level=1))
+            encoded.value += 1
+
+
+class FrameRecorder:
+    slots = 8  # Frames the ring holds while the encoder catches up
+
+    def __init__(self, directory, size, record_format="png", fps=None):
+        """Start recording frames of the given size into directory."""
+        if record_format not in RECORD_FORMATS:
+            raise ValueError(f"Unknown record format: {record_format}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = tuple(size)
+        self.record_format = record_format
+        self.fps = fps
+        self.frame_bytes = self.size[0] * self.size[1] * 3
+
+        # Backpressure metrics
+        self.frames = 0  # Frames handed to the encoder
+        self.dropped = 0  # Frames dropped because the ring was full
+        self.max_backlog = 0  # Most frames waiting in the ring at once
+        self.max_capture_ms = 0.0
+        self._capture_ms = 0.0
+
+        context = multiprocessing.get_context()
+        self._ring = context.RawArray(ctypes.c_ubyte, self.frame_bytes * self.slots)
+        self._buffer = memoryview(self._ring).cast("B")
+        self._free = context.Semaphore(self.slots)
+        self._filled = context.Semaphore(0)
+        self._stop_after = context.RawValue(ctypes.c_longlong, -1)
+        self._encoded = context.RawValue(ctypes.c_longlong, 0)
+        self._encoder = context.Process(
+            target=_encode_frames,
+            args=(self._ring, self.frame_bytes, self.slots, self.size, directory, record_format, self._filled, self._free, self._stop_after, self._encoded),
+            name="frame-encoder",
+            daemon=True,
+        )
+        self._encoder.start()
+
+    def capture(self, screen):
+        """Copy screen into the ring. Returns False if the frame was dropped."""
+        start = time.perf_counter()
+        if not self._free.acquire(False):
+            self.dropped += 1
+            return False
+        slot = self.frames % self.slots
+        self._buffer[slot * self.frame_bytes : (slot + 1) * self.frame_bytes] = pygame.image.tobytes(screen, "RGB")
+        self.frames += 1
+        self._filled.release()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._capture_ms += elapsed_ms
+        self.max_capture_ms = max(self.max_capture_ms, elapsed_ms)
+        self.max_backlog = max(self.max_backlog, self.frames - self._encoded.value)
+        return True
+
+    def stats(self):
+        """Recording and backpressure metrics."""
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "encoded": self._encoded.value,
+            "max_backlog": self.max_backlog,
+            "mean_capture_ms": self._capture_ms / self.frames if self.frames else 0.0,
+            "max_capture_ms": self.max_capture_ms,
+        }
+
+    def close(self):
+        """Wait for every captured frame to be written, then stop the encoder."""
+        if self._stop_after.value < 0:
+            self._stop_after.value = self.frames
+            self._filled.release()
+            self._encoder.join()
+            stats = self.stats()
+            with open(os.path.join(self.directory, "recording.json"), "w", encoding="utf-8") as f:
+                json.dump({"width": self.size[0], "height": self.size[1], "fps": self.fps, "format": self.record_format, **stats}, f, indent=2)
+            logging.info("Recorded %d frames to %s, %d dropped", stats["encoded"], self.directory, stats["dropped"])
+        return self.stats()
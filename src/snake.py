@@ -5,136 +5,207 @@ from .constants import (
     GRID_WIDTH,
     GRID_HEIGHT,
     GRID_SIZE,
-    UP,
-    DOWN,
-    LEFT,
-    RIGHT,
-    draw_rounded_rect,
+    SNAKE_GRADIENT_COLORS,
 )
+from .atlas import get_tile
+from .core import DIRECTIONS, SpeedEffect, SnakeState, initial_positions, collides, apply_food_effect, advance_snake
 from .particle_system import ParticleSystem
+from .profiler import profiler
+
+BODY_LAYER_KEY = (255, 0, 255)  # Transparent color of the body layer, never used for segments
 
 
 @dataclass
-class SnakeEffects:
+class SnakeEffects(SpeedEffect):
     """Properties related to snake effects and visuals."""
 
-    base_speed: int = 6  # Keep track of base speed
-    effect_end_time: int = 0  # Track when speed effect ends
     gradient_colors: list[tuple[int, int, int]] = None  # Snake gradient colors
 
     def __post_init__(self):
         if self.gradient_colors is None:
-            self.gradient_colors = [
-                (50, 205, 50),  # Light green
-                (34, 139, 34),  # Forest green
-                (0, 100, 0),  # Dark green
-            ]
+            self.gradient_colors = list(SNAKE_GRADIENT_COLORS)
 
 
-class Snake:
-    def __init__(self):
+class Snake(SnakeState):
+    def __init__(self, free_cells=None):
         """Initialize a new snake with default settings."""
-        # Essential attributes kept for testing
-        self.speed = 6  # Initial speed
-        self.length = 3
-        self.positions = []  # Will be set in _initialize_snake
-        self.direction = None  # Will be set in _initialize_snake
+        # Positions and direction will be set in _initialize_snake
+        super().__init__([], None, free_cells=free_cells)
 
         # Group other attributes in a dataclass
         self.effects = SnakeEffects()
         self.particle_system = ParticleSystem()
         self._initialize_snake()
 
+        # Fraction of the way the head has moved from its previous cell, for smooth rendering
+        self.interpolation = 1.0
+
         # Create cached surfaces for rendering
         self.particle_surface = pygame.Surface((GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE), pygame.SRCALPHA)
+        self._particle_bounds = None  # Area of particle_surface drawn on last frame
         self.cached_segment_surfaces = {}
         self._create_cached_segments()
 
+        # Body segments behind the head, drawn once and then updated incrementally. Segment
+        # tiles are fully opaque or fully clear, so a color key stands in for per-pixel alpha
+        # and the layer blits about twice as fast
+        self.body_layer = pygame.Surface((GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE))
+        self.body_layer.set_colorkey(BODY_LAYER_KEY)
+        self._reset_body_layer()
+
     def _initialize_snake(self):
         """Initialize or reset snake's position and length."""
         self.length = 3
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
-        # Start at center
-        center = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
-        self.positions = [center]
-        # Add body segments behind head based on direction
-        dx, dy = self.direction
-        for i in range(1, self.length):
-            self.positions.append(((center[0] - dx * i) % GRID_WIDTH, (center[1] - dy * i) % GRID_HEIGHT))
+        self.direction = random.choice(DIRECTIONS)
+        # Start at center with the body behind the head
+        self.positions = initial_positions(self.direction, self.length)
 
     def _create_cached_segments(self):
         """Create cached surfaces for snake segments with different colors."""
         for color in self.effects.gradient_colors:
-            surface = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
-            rect = pygame.Rect(2, 2, GRID_SIZE - 4, GRID_SIZE - 4)
-            draw_rounded_rect(surface, color, rect, 10)
-            self.cached_segment_surfaces[color] = surface
-
-    def get_head_position(self):
-        """Return the position of snake's head."""
-        return self.positions[0]
+            self.cached_segment_surfaces[color] = get_tile(color)
 
     def _check_collision(self, new_pos, obstacles):
         """Check if the new position results in a collision."""
-        # Check collision with obstacles
-        if new_pos in obstacles.positions:
-            return True
-        # Check collision with self (excluding the tail which will move)
-        if new_pos in self.positions[:-1]:
-            return True
-        return False
+        return collides(self, new_pos, obstacles.positions)
 
     def handle_food_effect(self, food_properties):
         """Handle the effects of different food types."""
-        # Handle speed change only
-        if food_properties["speed_change"] != 0:
-            self.effects.base_speed = self.speed  # Store current base speed
-            self.speed += food_properties["speed_change"]  # Apply speed change directly
-            self.speed = max(2, min(self.speed, 12))  # Keep speed between 2 and 12
-            if food_properties["duration"] > 0:
-                self.effects.effect_end_time = pygame.time.get_ticks() + food_properties["duration"]
+        apply_food_effect(self, food_properties, pygame.time.get_ticks())
 
     def update(self, obstacles):
         """Update snake position and check for collisions."""
-        # Check if speed effect should end
-        current_time = pygame.time.get_ticks()
-        if self.effects.effect_end_time > 0 and current_time >= self.effects.effect_end_time:
-            self.speed = self.effects.base_speed
-            self.effects.effect_end_time = 0
-
-        current = self.get_head_position()
-        dx, dy = self.direction
-        new_head = ((current[0] + dx) % GRID_WIDTH, (current[1] + dy) % GRID_HEIGHT)
-
-        # Check for collisions
-        if self._check_collision(new_head, obstacles):
-            return True  # Collision detected
-
-        # Move snake
-        self.positions.insert(0, new_head)
-        if len(self.positions) > self.length:
-            self.positions.pop()
-
-        return False  # No collision
+        return advance_snake(self, obstacles.positions, pygame.time.get_ticks())
 
     def render(self, screen):
-        """Render the snake on the screen."""
-        # Clear particle surface
-        self.particle_surface.fill((0, 0, 0, 0))
-
-        # Update and render particles to particle surface
-        self.particle_system.update()
-        self.particle_system.render(self.particle_surface)
-
-        # Draw particle surface
-        screen.blit(self.particle_surface, (0, 0))
-
-        # Render snake with gradient using cached surfaces
-        for i, pos in enumerate(self.positions):
-            # Calculate gradient color based on position in snake
-            gradient_index = (i * len(self.effects.gradient_colors)) // len(self.positions)
-            color = self.effects.gradient_colors[min(gradient_index, len(self.effects.gradient_colors) - 1)]
-
-            # Use cached surface for this color
-            segment_surface = self.cached_segment_surfaces[color]
-            screen.blit(segment_surface, (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE))
+        """Render the snake on the screen and return the areas drawn."""
+        rects = []
+
+        # Composite particles through the particle surface, touching only the area they cover
+        with profiler.span("particles"):
+            self.particle_system.update()
+            if self._particle_bounds is not None:
+                self.particle_surface.fill((0, 0, 0, 0), self._particle_bounds)
+                self._particle_bounds = None
+            bounds = self.particle_system.bounds()
+            if bounds is not None:
+                bounds = bounds.clip(self.particle_surface.get_rect())
+                self.particle_system.render(self.particle_surface)
+                rects.append(screen.blit(self.particle_surface, bounds, bounds))
+                self._particle_bounds = bounds
+
+        # Render the body from its layer, then the head on top
+        self._update_body_layer()
+        bounds = self._body_layer_bounds()
+        if bounds is not None:
+            rects.append(screen.blit(self.body_layer, bounds, bounds))
+        if len(self.positions):
+            head_surface = self.cached_segment_surfaces[self.effects.gradient_colors[0]]
+            rects.append(screen.blit(head_surface, self._head_render_position()))
+        return rects
+
+    def _reset_body_layer(self):
+        """Clear the body layer so the next update redraws every segment."""
+        self.body_layer.fill(BODY_LAYER_KEY)
+        self._layer_body = None  # SnakeBody the layer was drawn from
+        self._layer_colors = None
+        self._layer_ranges = []  # (first, end, color) ranges of push numbers drawn in each color
+        self._layer_segments = {}  # Push number -> position of each drawn segment
+        self._layer_cells = bytearray(GRID_WIDTH * GRID_HEIGHT)  # Drawn segments per cell
+        self._layer_rows = [0] * GRID_HEIGHT  # Drawn segments per row and column, for the bounds
+        self._layer_columns = [0] * GRID_WIDTH
+
+    def _gradient_ranges(self):
+        """Ranges of push numbers in each gradient color, leaving out the head.
+
+        Segment i gets color (i * colors) // length, so each color covers a run
+        of consecutive segments and only the runs' ends move as the snake does.
+        """
+        body = self.positions
+        colors = self.effects.gradient_colors
+        ranges = []
+        for k, color in enumerate(colors):
+            start = max(1, -(-k * len(body) // len(colors)))  # First segment index in this color
+            end = -(-(k + 1) * len(body) // len(colors))
+            if start < end:
+                ranges.append((body.pushed - end + 1, body.pushed - start + 1, color))
+        return ranges
+
+    def _update_body_layer(self):
+        """Bring the body layer in step with the snake, redrawing only segments that changed color.
+
+        A tick adds a segment behind the head, drops the tail and moves each
+        gradient boundary by about one segment, so this is O(1) per tick for
+        any length. Setting new positions or colors redraws the whole layer.
+        """
+        body = self.positions
+        if body is not self._layer_body or self.effects.gradient_colors != self._layer_colors:
+            self._reset_body_layer()
+            self._layer_body = body
+            self._layer_colors = list(self.effects.gradient_colors)
+        ranges = self._gradient_ranges()
+        if ranges == self._layer_ranges:
+            return
+
+        def color_at(color_ranges, number):
+            for first, end, color in color_ranges:
+                if first <= number < end:
+                    return color
+            return None
+
+        # Walk the spans between every old and new range end, redrawing those whose color changed
+        edges = sorted({edge for first, end, _ in self._layer_ranges + ranges for edge in (first, end)})
+        erased, drawn = [], set()
+        for first, end in zip(edges, edges[1:]):
+            old_color, new_color = color_at(self._layer_ranges, first), color_at(ranges, first)
+            if old_color == new_color:
+                continue
+            for number in range(first, end):
+                if old_color is not None:
+                    erased.append(self._erase_segment(number))
+                if new_color is not None:
+                    pos = body[body.pushed - number]
+                    self._draw_segment(number, pos, new_color)
+                    drawn.add(pos)
+        self._layer_ranges = ranges
+
+        # Erasing a cell another segment still covers only happens when the body overlaps itself
+        if any(pos not in drawn and self._layer_cells[pos[1] * GRID_WIDTH + pos[0]] for pos in erased):
+            self._reset_body_layer()
+            self._update_body_layer()
+
+    def _draw_segment(self, number, pos, color):
+        self.body_layer.fill(BODY_LAYER_KEY, (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+        self.body_layer.blit(self.cached_segment_surfaces[color], (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE))
+        self._layer_segments[number] = pos
+        self._layer_cells[pos[1] * GRID_WIDTH + pos[0]] += 1
+        self._layer_rows[pos[1]] += 1
+        self._layer_columns[pos[0]] += 1
+
+    def _erase_segment(self, number):
+        pos = self._layer_segments.pop(number)
+        self.body_layer.fill(BODY_LAYER_KEY, (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+        self._layer_cells[pos[1] * GRID_WIDTH + pos[0]] -= 1
+        self._layer_rows[pos[1]] -= 1
+        self._layer_columns[pos[0]] -= 1
+        return pos
+
+    def _body_layer_bounds(self):
+        """Area of the body layer holding segments, or None if it is empty."""
+        rows = [y for y, count in enumerate(self._layer_rows) if count]
+        if not rows:
+            return None
+        columns = [x for x, count in enumerate(self._layer_columns) if count]
+        return pygame.Rect(columns[0] * GRID_SIZE, rows[0] * GRID_SIZE, (columns[-1] - columns[0] + 1) * GRID_SIZE, (rows[-1] - rows[0] + 1) * GRID_SIZE)
+
+    def _head_render_position(self):
+        """Pixel position of the head, eased in from its previous cell by interpolation."""
+        head = self.positions[0]
+        x, y = head[0] * GRID_SIZE, head[1] * GRID_SIZE
+        if len(self.positions) > 1 and self.interpolation < 1:
+            previous = self.positions[1]
+            dx, dy = head[0] - previous[0], head[1] - previous[1]
+            if abs(dx) + abs(dy) == 1:  # Don't slide across the board when wrapping
+                lag = (1 - self.interpolation) * GRID_SIZE
+                x, y = x - dx * lag, y - dy * lag
+        return (round(x), round(y))
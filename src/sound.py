@@ -1,22 +1,72 @@
 import os
+import threading
+import time
+from types import SimpleNamespace
 import pygame
+from .constants import FOOD_TYPES
+from .synth import effect_sound, food_effect
+
+MIXER_SETTINGS = (44100, -16, 2)  # Frequency, sample format and channels the sounds are mixed at
+DEFAULT_LATENCY_MS = 12  # Budget for the mixer's output buffer, about 512 samples at 44.1 kHz
+
+_mixer = SimpleNamespace(buffer_size=None)  # Buffer size, in samples, the mixer was last opened with here
+
+
+def buffer_size(latency_ms, frequency=MIXER_SETTINGS[0]):
+    """Largest power-of-two buffer, in samples, that plays within latency_ms (at least 256)."""
+    size = 256
+    while size * 2 * 1000 <= latency_ms * frequency:
+        size *= 2
+    return size
 
 
 class SoundManager:
-    def __init__(self):
-        # Initialize sound system
-        pygame.mixer.quit()  # First close any running sound system
-        pygame.mixer.init(44100, -16, 2, 2048)
+    # Effect name -> (volume, priority); synthesized on first use or by the background loader
+    effects = {
+        **{food_effect(food_type): (0.4, 1) for food_type in FOOD_TYPES},
+        "speed_up": (0.3, 1),
+        "slow_down": (0.3, 1),
+        "crash": (0.3, 2),
+    }
+    music_file = "sounds/background.mp3"
+    music_volume = 0.8
+    effect_channels = 4  # Channels reserved for gameplay effects
+
+    def __init__(self, latency_ms=DEFAULT_LATENCY_MS, latency_hook=None):
+        """Open the mixer with a buffer that fits latency_ms.
+
+        latency_hook, if given, is called as latency_hook(name, latency_ms)
+        each time an effect starts. The latency is the time the play call
+        took plus one mixer buffer, the longest the mixer waits before
+        mixing a new sound into its output.
+        """
+        self.buffer_size = buffer_size(latency_ms)
+        self.buffer_ms = self.buffer_size * 1000 / MIXER_SETTINGS[0]
+        self.latency_hook = latency_hook
+
+        # Initialize sound system, reopening the mixer only if it runs at other settings
+        pygame.mixer.pre_init(*MIXER_SETTINGS, self.buffer_size)  # Also used if pygame.init() reopens it
+        if pygame.mixer.get_init() != MIXER_SETTINGS or _mixer.buffer_size != self.buffer_size:
+            pygame.mixer.quit()
+            pygame.mixer.init(*MIXER_SETTINGS, self.buffer_size)
+            _mixer.buffer_size = self.buffer_size
         pygame.mixer.set_num_channels(8)  # Set more channels
 
+        # Keep Sound.play() off the effect channels; music streams outside the channels
+        pygame.mixer.set_reserved(self.effect_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.effect_channels)]
+        self._voices = [(0, 0)] * self.effect_channels  # (priority, start order) of each channel's effect
+        self._started = 0
+        self.stolen = 0  # Effects cut off for one of at least equal priority
+        self.dropped = 0  # Effects not played because every channel had a more important one
+
         # Initialize sound properties
-        self.eat_sound = None
-        self.crash_sound = None
-        self.background_music = None
-        self.background_channel = pygame.mixer.Channel(0)
+        self._sounds = {}  # Effect name -> Sound, or None if it couldn't be loaded
+        self._load_lock = threading.Lock()
+        self.background_music = self.music_file if os.path.exists(self.music_file) else None
 
-        # Load sounds
-        self.load_sounds()
+        # Synthesize effects in the background so startup doesn't wait on them
+        self.load_sounds(background=True)
 
     def load_sound(self, file_path):
         """Load a sound file and return the Sound object."""
@@ -31,26 +81,46 @@ class SoundManager:
             print(f"Failed to load sound file {file_path}: {str(sound_load_error)}")
             return None
 
-    def load_sounds(self):
-        """Load all game sounds."""
-        self.eat_sound = self.load_sound("sounds/eat.wav")
-        self.crash_sound = self.load_sound("sounds/crash.wav")
-        self.background_music = self.load_sound("sounds/background.mp3")
-
-        # Set volumes
-        if self.eat_sound:
-            self.eat_sound.set_volume(0.4)
-        if self.crash_sound:
-            self.crash_sound.set_volume(0.3)
-        if self.background_music:
-            self.background_music.set_volume(0.8)
-            self.background_channel.set_volume(0.8)
+    def _effect(self, name):
+        """Return an effect's Sound, loading it now if the background loader hasn't yet."""
+        if name not in self._sounds:
+            with self._load_lock:
+                if name not in self._sounds:
+                    try:
+                        sound = effect_sound(name)
+                        sound.set_volume(self.effects[name][0])
+                    except pygame.error as e:
+                        print(f"Failed to synthesize sound {name}: {str(e)}")
+                        sound = None
+                    self._sounds[name] = sound
+        return self._sounds[name]
+
+    def load_sounds(self, background=False):
+        """Load all sound effects, or start loading them on a thread and return it."""
+        if not background:
+            for name in self.effects:
+                self._effect(name)
+            return None
+        thread = threading.Thread(target=self.load_sounds, name="sound-loader", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def eat_sound(self):
+        return self._effect(food_effect("normal"))
+
+    @property
+    def crash_sound(self):
+        return self._effect("crash")
 
     def play_background_music(self):
-        """Start playing background music on loop."""
+        """Start streaming background music on loop."""
         if self.background_music:
             try:
-                self.background_channel.play(self.background_music, loops=-1)
+                # pygame.mixer.music decodes as it plays instead of loading the whole track
+                pygame.mixer.music.load(self.background_music)
+                pygame.mixer.music.set_volume(self.music_volume)
+                pygame.mixer.music.play(loops=-1)
                 print("Background music started playing")
             except Exception as e:
                 print(f"Failed to play background music: {str(e)}")
@@ -58,19 +128,52 @@ class SoundManager:
     def pause_background_music(self):
         """Pause background music."""
         if self.background_music:
-            self.background_channel.pause()
+            pygame.mixer.music.pause()
 
     def resume_background_music(self):
         """Resume background music."""
         if self.background_music:
-            self.background_channel.unpause()
+            pygame.mixer.music.unpause()
+
+    def _claim_channel(self, priority):
+        """Index of a free effect channel, else of the oldest, least important voice at or below priority."""
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+        index = min(range(len(self.channels)), key=self._voices.__getitem__)
+        if self._voices[index][0] > priority:
+            return None
+        self.stolen += 1
+        return index
+
+    def play_effect(self, name):
+        """Play an effect on a reserved channel. Returns the Channel, or None if it didn't play."""
+        start = time.perf_counter()
+        sound = self._effect(name)
+        if not sound:
+            return None
+        priority = self.effects[name][1]
+        index = self._claim_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[index]
+        channel.play(sound)
+        self._started += 1
+        self._voices[index] = (priority, self._started)
+        if self.latency_hook:
+            self.latency_hook(name, (time.perf_counter() - start) * 1000 + self.buffer_ms)
+        return channel
 
-    def play_eat_sound(self):
-        """Play the eating sound effect."""
-        if self.eat_sound:
-            self.eat_sound.play()
+    def play_eat_sound(self, food_type="normal"):
+        """Play the sound of eating food_type, with a speed cue if the food changes speed."""
+        self.play_effect(food_effect(food_type))
+        speed_change = FOOD_TYPES[food_type]["speed_change"]
+        if speed_change > 0:
+            self.play_effect("speed_up")
+        elif speed_change < 0:
+            self.play_effect("slow_down")
 
     def play_crash_sound(self):
         """Play the crash sound effect."""
-        if self.crash_sound:
-            self.crash_sound.play()
+        self.play_effect("crash")
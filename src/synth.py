@@ -0,0 +1,98 @@
+"""Procedural sound effects.
+
+Each effect is described by a few parameters per layer: waveform, a pitch
+sweep or a run of notes, length and envelope. It is synthesized with NumPy
+into 16-bit samples for the mixer's format the first time it's needed and
+the samples are cached, so playing effects needs no audio files or decoding.
+"""
+
+import numpy as np
+import pygame
+
+# Effect name -> layers summed into the effect. Each layer has:
+#   wave: "sine", "square", "triangle" or "noise"
+#   hz, end_hz: starting and ending pitch, swept exponentially (end_hz defaults to hz)
+#   notes: pitch multipliers played one after another over the layer, for arpeggios
+#   ms: length; decay: exponential fade per second; gain: loudness before mixing
+TONES = {
+    "eat:normal": [{"wave": "sine", "hz": 660, "end_hz": 990, "ms": 90, "decay": 25, "gain": 0.8}],
+    "eat:golden": [
+        {"wave": "triangle", "hz": 784, "notes": (1, 1.25, 1.5, 2), "ms": 240, "decay": 8, "gain": 0.8},
+        {"wave": "sine", "hz": 1568, "notes": (1, 1.25, 1.5, 2), "ms": 240, "decay": 12, "gain": 0.2},
+    ],
+    "eat:speed": [{"wave": "square", "hz": 440, "end_hz": 1320, "ms": 110, "decay": 20, "gain": 0.35}],
+    "eat:slow": [{"wave": "triangle", "hz": 660, "end_hz": 330, "ms": 160, "decay": 12, "gain": 0.8}],
+    "speed_up": [{"wave": "sine", "hz": 220, "end_hz": 1760, "ms": 280, "decay": 4, "gain": 0.5}],
+    "slow_down": [{"wave": "sine", "hz": 1760, "end_hz": 220, "ms": 320, "decay": 4, "gain": 0.5}],
+    "crash": [
+        {"wave": "noise", "ms": 420, "decay": 9, "gain": 0.7},
+        {"wave": "sine", "hz": 130, "end_hz": 45, "ms": 420, "decay": 6, "gain": 0.6},
+    ],
+}
+
+FADE_MS = 4  # Ramp at each end of a layer, so effects start and stop without clicks
+
+_samples = {}  # (effect name, frequency, channels) -> int16 samples
+
+
+def _layer(params, frequency):
+    """Synthesize one layer as floats in [-1, 1]."""
+    count = int(frequency * params["ms"] / 1000)
+    t = np.arange(count) / frequency
+    wave = params["wave"]
+    if wave == "noise":
+        signal = np.random.default_rng(0).uniform(-1, 1, count)  # Seeded, so an effect sounds the same every run
+    else:
+        start = params["hz"]
+        pitch = start * (params.get("end_hz", start) / start) ** (t / t[-1])
+        notes = params.get("notes")
+        if notes:
+            pitch = pitch * np.asarray(notes)[np.arange(count) * len(notes) // count]
+        phase = 2 * np.pi * np.cumsum(pitch) / frequency
+        if wave == "sine":
+            signal = np.sin(phase)
+        elif wave == "square":
+            signal = np.sign(np.sin(phase))
+        elif wave == "triangle":
+            signal = 2 / np.pi * np.arcsin(np.sin(phase))
+        else:
+            raise ValueError(f"Unknown waveform: {wave}")
+
+    envelope = np.exp(-params.get("decay", 0) * t)
+    fade = min(int(frequency * FADE_MS / 1000), count // 2)
+    ramp = np.linspace(0, 1, fade, endpoint=False)
+    envelope[:fade] *= ramp
+    envelope[count - fade :] *= ramp[::-1]
+    return signal * envelope * params.get("gain", 1)
+
+
+def synthesize(layers, frequency, channels):
+    """Mix layers into int16 samples, shaped (samples, channels) for more than one channel."""
+    mixed = np.zeros(max(int(frequency * layer["ms"] / 1000) for layer in layers))
+    for layer in layers:
+        signal = _layer(layer, frequency)
+        mixed[: len(signal)] += signal
+    samples = (np.clip(mixed, -1, 1) * 32767).astype(np.int16)
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return samples
+
+
+def effect_samples(name):
+    """Return the cached samples of an effect for the open mixer, synthesizing them on first use."""
+    frequency, _, channels = pygame.mixer.get_init()
+    key = (name, frequency, channels)
+    samples = _samples.get(key)
+    if samples is None:
+        samples = _samples[key] = synthesize(TONES[name], frequency, channels)
+    return samples
+
+
+def effect_sound(name):
+    """Return a new Sound playing an effect."""
+    return pygame.sndarray.make_sound(effect_samples(name))
+
+
+def food_effect(food_type):
+    """Name of the effect played when food of food_type is eaten."""
+    return "eat:" + food_type
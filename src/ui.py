@@ -1,18 +1,56 @@
+import logging
 import os
+import queue
+import struct
+import threading
+import zlib
+from collections import OrderedDict
 from datetime import datetime
 import pygame
 
 from . import WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND, SCORE_COLOR, GAME_OVER_COLOR, get_font, draw_grid
+from .atlas import get_sprite
+from .profiler import profiler
+
+
+def encode_png(data, size, level=6):
+    """Encode RGB pixel bytes as a PNG file, compressed at the given zlib level.
+
+    Unlike pygame.image.save this releases the GIL while compressing, so it
+    can run on a worker thread without stalling the game loop.
+    """
+    width, height = size
+    stride = width * 3
+    # Each scanline starts with its filter type, 0 for none
+    scanlines = b"".join(b"\x00" + data[y * stride : (y + 1) * stride] for y in range(height))
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(scanlines, level)) + chunk(b"IEND", b"")
 
 
 class Screenshot:
     delay_ms = 500
+    max_pending = 4  # Captures waiting to be encoded; more are dropped
+
+    def __init__(self, directory="screenshots"):
+        """Initialize screenshots saved to directory by a background encoder.
 
-    def __init__(self):
+        A capture copies the screen's pixels and queues them; a worker thread
+        encodes and writes the PNG, so frame time is unaffected. When the
+        encoder falls max_pending captures behind, new captures are dropped.
+        """
         self.pending = False
         self.scheduled_time = 0
-        self.directory = "screenshots"
+        self.directory = directory
         os.makedirs(self.directory, exist_ok=True)
+        self.dropped = 0  # Captures dropped because the queue was full
+        self._queue = queue.Queue(self.max_pending)
+        self._worker = None
+        self._last_timestamp = None
+        self._same_second = 0  # Captures already taken in _last_timestamp's second
 
     def schedule(self):
         """Schedule a screenshot to be taken after delay_ms"""
@@ -26,23 +64,141 @@ class Screenshot:
 
         current_time = pygame.time.get_ticks()
         if current_time >= self.scheduled_time:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            path = f"{self.directory}/snake_{timestamp}.png"
-            pygame.image.save(screen, path)
+            self.capture(screen)
             self.pending = False
 
+    def capture(self, screen):
+        """Queue a copy of screen to be saved, or drop it if the encoder is behind."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._encode_loop, name="screenshot-encoder", daemon=True)
+            self._worker.start()
+        try:
+            self._queue.put_nowait((pygame.image.tobytes(screen, "RGB"), screen.get_size(), self._next_path()))
+        except queue.Full:
+            self.dropped += 1
+            logging.warning("Screenshot dropped, %d still being saved", self.max_pending)
+
+    def _next_path(self):
+        """Path for a new screenshot, numbered when several are taken in the same second."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if timestamp == self._last_timestamp:
+            self._same_second += 1
+        else:
+            self._last_timestamp, self._same_second = timestamp, 0
+        while True:
+            suffix = f"_{self._same_second}" if self._same_second else ""
+            path = f"{self.directory}/snake_{timestamp}{suffix}.png"
+            if not os.path.exists(path):
+                return path
+            self._same_second += 1
+
+    def _encode_loop(self):
+        while True:
+            data, size, path = self._queue.get()
+            try:
+                temp_path = path + ".tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(encode_png(data, size))
+                os.replace(temp_path, path)
+            except Exception as e:  # One bad frame mustn't stop the encoder, or flush() would wait forever
+                logging.error("Failed to save screenshot %s: %s", path, str(e))
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Wait until every queued screenshot has been saved."""
+        self._queue.join()
+
 
 class GameRenderer:
-    def __init__(self):
-        """Initialize the game renderer with a cached background"""
+    text_cache_size = 64  # Rendered text surfaces kept for reuse
+    profiler_refresh_ms = 500  # How often the profiler overlay's numbers update
+
+    def __init__(self, dirty_rects=False):
+        """Initialize the game renderer with a cached background.
+
+        With dirty_rects enabled, render_game only restores the background
+        where something was drawn last frame, and present() pushes just the
+        areas that were cleared or drawn instead of the whole window.
+        """
         self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        self.background.fill(BACKGROUND)
-        draw_grid(self.background)
+        baked = get_sprite("background")
+        if baked is not None:
+            self.background.blit(baked, (0, 0))
+        else:
+            self.background.fill(BACKGROUND)
+            draw_grid(self.background)
+
+        self.dirty_rects = dirty_rects
+        self._previous_rects = []  # Areas drawn over the background last frame
+        self._update_rects = None  # Areas to push in present(), None for the whole window
+        self._full_redraw = True
+        self._backdrop = None  # What was drawn under the game objects last frame
+
+        # Rendered text surfaces by (text, color, size), least recently used first
+        self._text_cache = OrderedDict()
+
+        # Profiler overlay, redrawn from fresh percentiles every profiler_refresh_ms
+        self.show_profiler = False
+        self._profiler_panel = None
+        self._profiler_drawn_at = 0
+
+    def toggle_profiler(self):
+        """Show or hide the frame profiler overlay, profiling only while it shows."""
+        self.show_profiler = not self.show_profiler
+        if profiler.enabled != self.show_profiler:
+            profiler.toggle()
+        self._profiler_panel = None
+        self.invalidate()
+
+    def render_profiler(self, screen):
+        """Draw the profiler's p50/p95/p99 span times in the bottom-left corner, returning the area drawn."""
+        now = pygame.time.get_ticks()
+        if self._profiler_panel is None or now - self._profiler_drawn_at >= self.profiler_refresh_ms:
+            self._profiler_panel = self._draw_profiler_panel(profiler.percentiles())
+            self._profiler_drawn_at = now
+        panel_rect = self._profiler_panel.get_rect(bottomleft=(10, WINDOW_HEIGHT - 10))
+        return screen.blit(self._profiler_panel, panel_rect)
+
+    def _draw_profiler_panel(self, report):
+        # Rendered directly rather than through the text cache, since the numbers change every refresh
+        font = get_font(16, bold=False)
+        rows = [("span", "p50", "p95", "p99 ms")]
+        for name in sorted(report, key=lambda name: (name != "frame", name)):
+            rows.append((name,) + tuple(f"{ms:.2f}" for ms in report[name]))
+        cells = [[font.render(text, True, SCORE_COLOR) for text in row] for row in rows]
+
+        # Names left-aligned, numbers right-aligned in columns as wide as their widest cell
+        widths = [max(row[column].get_width() for row in cells) + 10 for column in range(len(rows[0]))]
+        line_height = font.get_linesize()
+        panel = pygame.Surface((sum(widths) + 2, line_height * len(rows) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, row in enumerate(cells):
+            y = 4 + i * line_height
+            panel.blit(row[0], (6, y))
+            x = widths[0]
+            for width, cell in zip(widths[1:], row[1:]):
+                x += width
+                panel.blit(cell, cell.get_rect(topright=(x - 4, y)))
+        return panel
+
+    def invalidate(self):
+        """Force the next game frame to redraw and present the whole window."""
+        self._full_redraw = True
+        self._previous_rects = []
+        self._update_rects = None
+
+    def present(self):
+        """Push the current frame to the display."""
+        if self._update_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._update_rects)
+        self._update_rects = None
 
     def render_text(self, screen, text, color, position, size=32, align="center"):
-        """Render text with specified alignment (center, left, or right)."""
-        font = get_font(size)
-        text_surface = font.render(text, True, color)
+        """Render text with specified alignment (center, left, or right), returning the area drawn."""
+        text_surface = self._get_text_surface(text, color, size)
         text_rect = text_surface.get_rect()
 
         if align == "center":
@@ -52,10 +208,24 @@ class GameRenderer:
         else:  # left align
             text_rect.topleft = position
 
-        screen.blit(text_surface, text_rect)
+        return screen.blit(text_surface, text_rect)
+
+    def _get_text_surface(self, text, color, size):
+        """Return the rendered text, re-rasterizing only on a cache miss."""
+        key = (text, color, size)
+        text_surface = self._text_cache.get(key)
+        if text_surface is None:
+            text_surface = get_font(size).render(text, True, color)
+            self._text_cache[key] = text_surface
+            if len(self._text_cache) > self.text_cache_size:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return text_surface
 
     def show_start_menu(self, screen):
         """Show start menu screen"""
+        self.invalidate()
         screen.blit(self.background, (0, 0))
 
         # Title
@@ -66,6 +236,7 @@ class GameRenderer:
 
     def show_game_over(self, screen, score, high_score):
         """Show game over screen"""
+        self.invalidate()
         screen.blit(self.background, (0, 0))
 
         # Game Over text
@@ -80,27 +251,62 @@ class GameRenderer:
 
     def render_game(self, screen, snake, food, obstacles, score, high_score, start_time, screenshot_manager=None):
         """Render the game screen with all components."""
-        # Draw background with grid
-        screen.blit(self.background, (0, 0))
+        # Obstacles that can be baked into the background cost nothing per frame
+        if hasattr(obstacles, "composite"):
+            with profiler.span("obstacles"):
+                backdrop = obstacles.composite(self.background)
+            game_objects = (("snake", snake), ("food", food))
+        else:
+            backdrop = self.background
+            game_objects = (("snake", snake), ("food", food), ("obstacles", obstacles))
 
-        # Game objects
-        snake.render(screen)
-        food.render(screen)
-        obstacles.render(screen)
+        full_redraw = not self.dirty_rects or self._full_redraw or backdrop is not self._backdrop
+        self._backdrop = backdrop
+        if full_redraw:
+            # Draw background with grid
+            screen.blit(backdrop, (0, 0))
+        else:
+            # Only erase what was drawn last frame
+            for rect in self._previous_rects:
+                screen.blit(backdrop, rect, rect)
 
-        # Draw scores
-        self.render_text(screen, f"Score: {score}", SCORE_COLOR, (10, 10), 32, align="left")
-        self.render_text(screen, f"High Score: {high_score}", SCORE_COLOR, (WINDOW_WIDTH - 10, 10), 32, align="right")
+        # Game objects report the areas they drew; None means they can't
+        drawn = []
+        tracked = True
+        for name, game_object in game_objects:
+            with profiler.span(name):
+                rects = game_object.render(screen)
+            if rects is None:
+                tracked = False
+            else:
+                drawn.extend(rects)
 
-        # Calculate and render timer
-        elapsed_time = (pygame.time.get_ticks() - start_time) // 1000
-        self.render_text(screen, f"Time: {elapsed_time}s", SCORE_COLOR, (WINDOW_WIDTH // 2, 20), 32, align="center")
+        with profiler.span("hud"):
+            # Draw scores
+            drawn.append(self.render_text(screen, f"Score: {score}", SCORE_COLOR, (10, 10), 32, align="left"))
+            drawn.append(self.render_text(screen, f"High Score: {high_score}", SCORE_COLOR, (WINDOW_WIDTH - 10, 10), 32, align="right"))
+
+            # Calculate and render timer
+            elapsed_time = (pygame.time.get_ticks() - start_time) // 1000
+            drawn.append(self.render_text(screen, f"Time: {elapsed_time}s", SCORE_COLOR, (WINDOW_WIDTH // 2, 20), 32, align="center"))
+
+        if self.show_profiler:
+            drawn.append(self.render_profiler(screen))
 
         if screenshot_manager:
             screenshot_manager.update(screen)
 
+        if full_redraw or not tracked:
+            self._update_rects = None
+        else:
+            self._update_rects = self._previous_rects + drawn
+        # Without every object's areas the next frame can't erase selectively
+        self._full_redraw = not tracked
+        self._previous_rects = drawn
+
     def show_pause_menu(self, screen, score):
         """Show pause menu screen"""
+        self.invalidate()
         # Semi-transparent overlay
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
         overlay.fill((0, 0, 0))
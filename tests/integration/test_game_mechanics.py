@@ -19,7 +19,7 @@ class TestGameMechanics(SnakeGameTest):
 
         # Create a mock sound manager
         class MockSoundManager:
-            def play_eat_sound(self):
+            def play_eat_sound(self, food_type="normal"):
                 pass
 
             def play_crash_sound(self):
@@ -162,7 +162,7 @@ def test_food_collision_effects(setup_game):
 
     # Mock sound manager
     class MockSoundManager:
-        def play_eat_sound(self):
+        def play_eat_sound(self, food_type="normal"):
             pass
 
         def play_crash_sound(self):
@@ -16,6 +16,7 @@ class TestScreenshot(TestCase):
         self.screenshot.directory = self.test_dir
 
     def tearDown(self):
+        self.screenshot.flush()
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
         pygame.quit()
@@ -57,6 +58,7 @@ class TestScreenshot(TestCase):
         self.screenshot.scheduled_time = 0  # Force time to have elapsed
         initial_files = os.listdir(self.test_dir)
         self.screenshot.update(self.screen)
+        self.screenshot.flush()
         final_files = os.listdir(self.test_dir)
 
         # Should have one new file
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+import pygame
+from src import atlas
+from src.atlas import ATLAS_INDEX, build_atlas, load_atlas, use_atlas, get_sprite, get_tile, draw_tile, tile_name, emoji_name
+from src.constants import WINDOW_WIDTH, WINDOW_HEIGHT, OBSTACLE_COLOR
+from src.food import EMOJI_SIZE, get_emoji, _emoji_cache
+from src.ui import GameRenderer
+
+
+class TestAtlas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        use_atlas(None)
+        _emoji_cache.clear()
+        self.directory.cleanup()
+
+    def test_load_builds_missing_atlas(self):
+        """Test loading with no atlas on disk bakes one with all the static art."""
+        loaded = load_atlas(self.path)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.sprites["background"].get_size(), (WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.assertIn(tile_name(OBSTACLE_COLOR), loaded)
+        self.assertEqual(loaded.sprites[emoji_name("🍕")].get_size(), EMOJI_SIZE)
+
+    def test_sprites_match_runtime_drawing(self):
+        """Test baked tiles are pixel-identical to tiles drawn at runtime."""
+        loaded = load_atlas(self.path)
+        baked = loaded.sprites[tile_name(OBSTACLE_COLOR)]
+        drawn = draw_tile(OBSTACLE_COLOR)
+        for point in [(0, 0), (2, 2), (3, 3), (20, 20), (37, 37), (39, 39)]:
+            self.assertEqual(baked.get_at(point), drawn.get_at(point))
+
+    def test_stale_atlas_is_rebuilt(self):
+        """Test an atlas baked from different constants is replaced."""
+        build_atlas(self.path)
+        index_path = os.path.join(self.path, ATLAS_INDEX)
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+        index["hash"] = "stale"
+        with open(index_path, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+
+        self.assertIsNone(load_atlas(self.path, rebuild=False))
+        self.assertIsNotNone(load_atlas(self.path))
+        with open(index_path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["hash"], atlas.content_hash())
+
+    def test_truncated_image_is_rejected(self):
+        """Test an image that doesn't match its index isn't mapped."""
+        build_atlas(self.path)
+        with open(os.path.join(self.path, atlas.ATLAS_IMAGE), "r+b") as file:
+            file.truncate(100)
+        with self.assertLogs(level="ERROR"):
+            self.assertIsNone(load_atlas(self.path, rebuild=False))
+
+    def test_sprites_served_from_atlas_in_use(self):
+        """Test tiles, emoji and the background come from the atlas once it is in use."""
+        self.assertIsNone(get_sprite("background"))
+        loaded = load_atlas(self.path)
+        use_atlas(loaded)
+        self.assertIs(get_tile(OBSTACLE_COLOR), loaded.sprites[tile_name(OBSTACLE_COLOR)])
+        self.assertIs(get_emoji("🍕"), loaded.sprites[emoji_name("🍕")])
+        self.assertEqual(get_tile((1, 2, 3)).get_at((20, 20)), (1, 2, 3, 255))  # Colors outside the atlas are drawn
+        renderer = GameRenderer()
+        self.assertEqual(renderer.background.get_at((0, 0)), loaded.sprites["background"].get_at((0, 0)))
+
+    def test_sprites_converted_for_display(self):
+        """Test using the atlas once a display is set converts its sprites to the display format."""
+        loaded = load_atlas(self.path)
+        pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        tile = loaded.sprites[tile_name(OBSTACLE_COLOR)]
+        use_atlas(loaded)
+        converted = get_tile(OBSTACLE_COLOR)
+        self.assertEqual(converted.get_masks(), draw_tile(OBSTACLE_COLOR).convert_alpha().get_masks())
+        self.assertEqual(converted.get_size(), tile.get_size())
+        for pos in ((0, 0), (20, 20), (3, 20)):
+            self.assertEqual(converted.get_at(pos), tile.get_at(pos))
@@ -0,0 +1,172 @@
+import random
+import unittest
+import numpy as np
+from src.batch import BatchGame, FOOD_TYPE_NAMES
+from src.core import GameCore, DIRECTIONS, move
+from src import OBSTACLE_COUNT, RIGHT
+
+
+class TestBatchGame(unittest.TestCase):
+    """Unit tests for the vectorised batch engine."""
+
+    def setUp(self):
+        """Set up a batch of games before each test."""
+        self.batch = BatchGame(64, seed=0)
+
+    def test_reset(self):
+        """Test every board starts with a snake, obstacles and food that don't overlap."""
+        self.assertTrue((self.batch.occupancy.sum(axis=1) == 3).all())
+        self.assertTrue((self.batch.obstacles.sum(axis=1) == OBSTACLE_COUNT).all())
+        self.assertTrue(((self.batch.food >= 0).sum(axis=1) == self.batch.max_foods).all())
+        self.assertFalse((self.batch.obstacles & (self.batch.occupancy > 0)).any())
+        self.assertFalse((self.batch.obstacles & (self.batch.food >= 0)).any())
+        self.assertFalse(self.batch.done.any())
+
+    def test_matches_game_core(self):
+        """Test boards loaded from a GameCore play the same moves until food respawns."""
+        actions = random.Random(1)
+        for seed in range(20):
+            core = GameCore(seed=seed)
+            batch = BatchGame(1, seed=seed)
+            batch.load(0, core)
+            for _ in range(100):
+                action = actions.randrange(-1, len(DIRECTIONS))
+                result = core.step(DIRECTIONS[action] if action >= 0 else None)
+                eaten, done = batch.step([action])
+
+                self.assertEqual(batch.positions(0), core.snake.positions)
+                self.assertEqual(bool(done[0]), result.game_over)
+                self.assertEqual(int(batch.score[0]), core.score)
+                self.assertEqual(int(batch.speed[0]), core.snake.speed)
+                self.assertEqual(int(batch.time[0]), core.time)
+                if result.game_over or result.food_type:
+                    self.assertEqual(FOOD_TYPE_NAMES[eaten[0]] if eaten[0] >= 0 else None, result.food_type)
+                    break
+
+    def test_matches_game_core_across_levels(self):
+        """Test boards reloaded after every meal keep matching a GameCore through several obstacle spawns."""
+        for seed in (0, 3, 4, 6):  # Seeds whose food-chasing games get past level three
+            core = GameCore(seed=seed)
+            batch = BatchGame(1, seed=seed)
+            batch.load(0, core)
+            spawns = 0
+            for _ in range(3000):
+                action = self._towards_food(core)
+                result = core.step(DIRECTIONS[action] if action >= 0 else None)
+                _, done = batch.step([action])
+
+                self.assertEqual(batch.positions(0), core.snake.positions)
+                self.assertEqual(bool(done[0]), result.game_over)
+                self.assertEqual(int(batch.score[0]), core.score)
+                self.assertEqual(int(batch.speed[0]), core.snake.speed)
+                self.assertEqual(int(batch.obstacles[0].sum()), len(core.obstacles))
+                self.assertFalse((batch.obstacles[0] & (batch.food[0] >= 0)).any())
+                self.assertFalse((batch.obstacles[0] & (batch.occupancy[0] > 0)).any())
+                if result.game_over:
+                    break
+                if result.food_type:
+                    spawns += core.score % 10 == 0
+                    batch.load(0, core)  # The two pick new food and obstacle cells from different generators
+            self.assertGreaterEqual(spawns, 3, f"seed {seed} crashed before three obstacle spawns")
+
+    @staticmethod
+    def _towards_food(core):
+        """Index of the safe direction closest to some food, or -1 to keep going."""
+        head = core.snake.get_head_position()
+        best, best_distance = -1, None
+        for index, direction in enumerate(DIRECTIONS):
+            if direction == (-core.snake.direction[0], -core.snake.direction[1]):
+                continue
+            cell = move(head, direction)
+            if cell in core.obstacles or cell in core.snake.positions[:-1]:
+                continue
+            distance = min(min(abs(cell[0] - x), core.width - abs(cell[0] - x)) + min(abs(cell[1] - y), core.height - abs(cell[1] - y)) for x, y in core.foods)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = index, distance
+        return best
+
+    def test_obstacles_avoid_food(self):
+        """Test a new obstacle never lands on food, even when food is on the only cell it could take."""
+        core = GameCore(seed=5)
+        core.score = 9
+        core.snake.length += 1  # Still growing, so the tail stays put
+        target = move(core.snake.get_head_position(), core.snake.direction)
+        core.foods = {target: "normal"}
+        self.batch.load(0, core)
+        self.batch.max_foods = 1
+
+        # Block everything but the snake, the food it's about to eat and one cell well away from it
+        board = self.batch.obstacles[0]
+        board[:] = self.batch.occupancy[0] == 0
+        board[target[1] * self.batch.width + target[0]] = False
+        spare = (target[0], (target[1] + self.batch.height // 2) % self.batch.height)
+        board[spare[1] * self.batch.width + spare[0]] = False
+        obstacle_count = board.sum()
+
+        self.batch.step()
+
+        self.assertEqual(self.batch.food[0, spare[1] * self.batch.width + spare[0]], FOOD_TYPE_NAMES.index("normal"))
+        self.assertEqual(board.sum(), obstacle_count)
+
+    def test_eating_food(self):
+        """Test eating food scores, grows the snake and respawns food."""
+        core = GameCore(seed=2)
+        target = move(core.snake.get_head_position(), core.snake.direction)
+        core.obstacles.discard(target)
+        core.foods = {target: "speed"}
+        self.batch.load(0, core)
+
+        eaten, done = self.batch.step()
+
+        self.assertEqual(FOOD_TYPE_NAMES[eaten[0]], "speed")
+        self.assertFalse(done[0])
+        self.assertEqual(self.batch.score[0], 1)
+        self.assertEqual(self.batch.length[0], 4)
+        self.assertEqual(self.batch.speed[0], core.snake.speed + 2)
+        self.assertEqual((self.batch.food[0] >= 0).sum(), 1)
+
+    def test_obstacle_every_ten_points(self):
+        """Test reaching a multiple of ten adds an obstacle and speeds up."""
+        core = GameCore(seed=3)
+        core.score = 9
+        target = move(core.snake.get_head_position(), core.snake.direction)
+        core.obstacles.discard(target)
+        core.foods = {target: "normal"}
+        self.batch.load(0, core)
+        obstacle_count = self.batch.obstacles[0].sum()
+
+        self.batch.step()
+
+        self.assertEqual(self.batch.obstacles[0].sum(), obstacle_count + 1)
+        self.assertEqual(self.batch.speed[0], core.snake.speed + 1)
+        self.assertFalse((self.batch.obstacles[0] & (self.batch.occupancy[0] > 0)).any())
+
+    def test_done_boards_stay_put_until_reset(self):
+        """Test crashed boards stop moving and reset restarts them."""
+        core = GameCore(seed=4)
+        core.snake.positions = [(5, 5), (4, 5), (3, 5)]
+        core.snake.direction = RIGHT
+        core.obstacles = {(6, 5)}
+        self.batch.load(0, core)
+
+        _, done = self.batch.step()
+        self.assertTrue(done[0])
+        self.assertEqual(done.sum(), 1)
+        positions = self.batch.positions(0)
+        self.batch.step()
+        self.assertEqual(self.batch.positions(0), positions)
+
+        self.batch.reset(done)
+        self.assertFalse(self.batch.done.any())
+        self.assertEqual(self.batch.score[0], 0)
+
+    def test_occupancy_tracks_body(self):
+        """Test the occupancy grid always matches the ring buffer bodies."""
+        actions = np.random.default_rng(5)
+        for _ in range(300):
+            _, done = self.batch.step(actions.integers(-1, 4, self.batch.num_games))
+            self.batch.reset(done)
+        for index in range(self.batch.num_games):
+            cells = [y * self.batch.width + x for x, y in self.batch.positions(index)]
+            expected = np.bincount(cells, minlength=self.batch.cells)
+            self.assertTrue((self.batch.occupancy[index] == expected).all())
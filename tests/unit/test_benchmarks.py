@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+import pygame
+from benchmarks import run as bench
+from src import GRID_WIDTH, GRID_HEIGHT
+
+
+class TestBenchmarks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def test_board_cycle_visits_every_cell_once(self):
+        """Test the snake benchmarks' path is a cycle of neighbouring cells covering the board."""
+        cycle = bench.board_cycle()
+        self.assertEqual(len(set(cycle)), GRID_WIDTH * GRID_HEIGHT)
+        self.assertEqual(len(cycle), GRID_WIDTH * GRID_HEIGHT)
+        for (x, y), (next_x, next_y) in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertEqual(abs(next_x - x) + abs(next_y - y), 1)
+
+    def test_full_board_snake_keeps_moving(self):
+        """Test a snake filling the board can follow the cycle without crashing."""
+        snake, step = bench.cycle_snake(bench.BOARD_CELLS, bench.empty_board())
+        for _ in range(bench.BOARD_CELLS + 5):
+            step()
+        self.assertEqual(len(snake.positions), bench.BOARD_CELLS)
+
+    def test_run_covers_every_benchmark(self):
+        """Test a scaled-down run measures every benchmark."""
+        report = bench.run(repeat=1, scale=0.01)
+        self.assertEqual(report["format"], bench.FORMAT)
+        self.assertEqual(set(report["results"]), set(bench.benchmarks()))
+        for result in report["results"].values():
+            self.assertGreater(result["median_us"], 0)
+            self.assertLessEqual(result["min_us"], result["median_us"])
+
+    def test_compare_flags_regressions(self):
+        """Test benchmarks slower than the threshold allows are flagged, and new ones skipped."""
+        baseline = {"results": {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}}}
+        current = {"results": {"a": {"median_us": 12.0}, "b": {"median_us": 13.0}, "c": {"median_us": 1.0}}}
+        rows = bench.compare(current, baseline, 0.25)
+        self.assertEqual([(name, regressed) for name, _, _, _, regressed in rows], [("a", False), ("b", True)])
+
+    def test_main_writes_results_and_fails_on_regression(self):
+        """Test the command line writes JSON results and exits 1 when a benchmark regressed."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            baseline = os.path.join(directory, "baseline.json")
+            args = ["--quick", "--repeat", "1", "--filter", "food.random_position[fill=0.0]", "-o", output]
+            self.assertEqual(bench.main(args), 0)
+            pygame.init()  # main quits pygame when it's done
+            with open(output, encoding="utf-8") as f:
+                report = json.load(f)
+            self.assertEqual(list(report["results"]), ["food.random_position[fill=0.0]"])
+
+            report["results"]["food.random_position[fill=0.0]"]["median_us"] = 1e-6
+            with open(baseline, "w", encoding="utf-8") as f:
+                json.dump(report, f)
+            self.assertEqual(bench.main(args + ["--baseline", baseline]), 1)
+            pygame.init()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import pygame
-from src.constants import draw_rounded_rect, draw_grid
+from src.constants import draw_rounded_rect, draw_grid, get_font
 
 
 class TestConstants(unittest.TestCase):
@@ -26,3 +26,19 @@ class TestConstants(unittest.TestCase):
         # Check if grid lines were drawn (color changed)
         self.assertNotEqual(surface.get_at((40, 0)), initial_color)
         self.assertNotEqual(surface.get_at((0, 40)), initial_color)
+
+    def test_get_font_is_cached(self):
+        """Test fonts are loaded once per size and boldness"""
+        font = get_font(32)
+        self.assertIs(get_font(32), font)
+        self.assertIsNot(get_font(32, bold=False), font)
+        self.assertIsNot(get_font(24), font)
+        self.assertFalse(get_font(24, bold=False).get_bold())
+
+    def test_font_cache_cleared_on_quit(self):
+        """Test fonts are reloaded after pygame is restarted"""
+        font = get_font(32)
+        pygame.quit()
+        pygame.init()
+        self.assertIsNot(get_font(32), font)
+        self.assertGreater(get_font(32).render("x", True, (255, 255, 255)).get_width(), 0)
@@ -0,0 +1,228 @@
+import random
+import unittest
+from src.grid import FreeCells
+from src.core import GameCore, SnakeBody, SnakeState, StepResult, advance_snake, collision_cause, danger_zone, eat_food, move, place_obstacle, roll_food_type
+from src import GRID_WIDTH, GRID_HEIGHT, FOOD_TYPES, UP, DOWN, LEFT, RIGHT
+
+
+class TestCoreRules(unittest.TestCase):
+    """Unit tests for the pygame-free rule functions."""
+
+    def test_move_wraps_around(self):
+        """Test movement wraps at every edge."""
+        self.assertEqual(move((GRID_WIDTH - 1, 0), RIGHT), (0, 0))
+        self.assertEqual(move((0, 0), LEFT), (GRID_WIDTH - 1, 0))
+        self.assertEqual(move((0, 0), UP), (0, GRID_HEIGHT - 1))
+        self.assertEqual(move((0, GRID_HEIGHT - 1), DOWN), (0, 0))
+
+    def test_advance_snake(self):
+        """Test the snake moves, keeps its length and detects collisions."""
+        snake = SnakeState([(5, 5), (4, 5), (3, 5)], RIGHT)
+        self.assertFalse(advance_snake(snake, set(), 0))
+        self.assertEqual(snake.positions, [(6, 5), (5, 5), (4, 5)])
+        self.assertTrue(advance_snake(snake, {(7, 5)}, 0))
+        self.assertEqual(snake.positions, [(6, 5), (5, 5), (4, 5)])
+
+    def test_speed_effect_expires_on_simulated_clock(self):
+        """Test speed effects are timed by the time passed in, not pygame."""
+        snake = SnakeState([(5, 5), (4, 5), (3, 5)], RIGHT)
+        snake.effects.base_speed = 6
+        snake.speed = 8
+        snake.effects.effect_end_time = 1000
+        advance_snake(snake, set(), 999)
+        self.assertEqual(snake.speed, 8)
+        advance_snake(snake, set(), 1000)
+        self.assertEqual(snake.speed, 6)
+
+    def test_eat_food(self):
+        """Test eating grows the snake, applies the food's effect and levels up every LEVEL_POINTS points."""
+        snake = SnakeState([(5, 5), (4, 5), (3, 5)], RIGHT)
+        added = []
+        score = eat_food(snake, FOOD_TYPES["speed"], 0, 500, lambda: added.append(True))
+        self.assertEqual((score, snake.length, snake.speed, snake.effects.effect_end_time), (1, 4, 8, 5500))
+        self.assertEqual(added, [])
+
+        score = eat_food(snake, FOOD_TYPES["golden"], 8, 600, lambda: added.append(True))
+        self.assertEqual((score, snake.length, snake.speed), (10, 6, 9))
+        self.assertEqual(added, [True])
+
+    def test_place_obstacle_avoids_danger_zone(self):
+        """Test obstacle placement skips the snake and the cells ahead of it."""
+        rng = random.Random(1)
+        for free_cells in (FreeCells(), None):
+            snake = SnakeState([(5, 5), (4, 5), (3, 5)], RIGHT, free_cells=free_cells)
+            free_cells = free_cells or FreeCells()
+            free_count = len(free_cells)
+            for _ in range(50):
+                pos = place_obstacle(rng, snake, free_cells)
+                self.assertNotIn(pos, danger_zone((5, 5), RIGHT))
+                self.assertNotIn(pos, snake.positions)
+            self.assertEqual(len(free_cells), free_count)
+
+    def test_place_obstacle_on_crowded_board(self):
+        """Test the last free cell outside the danger zone is always found."""
+        free_cells = FreeCells()
+        snake = SnakeState([(5, 5)], RIGHT, free_cells=free_cells)
+        danger = danger_zone((5, 5), RIGHT)
+        for x in range(GRID_WIDTH):
+            for y in range(GRID_HEIGHT):
+                if (x, y) not in danger and (x, y) not in {(5, 5), (0, 0)}:
+                    free_cells.block((x, y))
+        self.assertEqual(place_obstacle(random.Random(2), snake, free_cells), (0, 0))
+        free_cells.block((0, 0))
+        self.assertIsNone(place_obstacle(random.Random(2), snake, free_cells))
+        self.assertEqual(len(free_cells), len(danger))
+
+    def test_roll_food_type(self):
+        """Test food rolls only produce known types."""
+        core = GameCore(seed=2)
+        for _ in range(100):
+            self.assertIn(roll_food_type(core.rng), FOOD_TYPES)
+
+
+class TestSnakeBody(unittest.TestCase):
+    """Unit tests for the occupancy-tracking snake body."""
+
+    def test_occupancy_follows_head_and_tail(self):
+        """Test pushing the head and popping the tail keep the counts in step."""
+        body = SnakeBody([(5, 5), (4, 5), (3, 5)])
+        self.assertIn((3, 5), body)
+        body.push_head((6, 5))
+        self.assertEqual(body.pop_tail(), (3, 5))
+        self.assertNotIn((3, 5), body)
+        self.assertIn((6, 5), body)
+        self.assertEqual(body, [(6, 5), (5, 5), (4, 5)])
+        self.assertEqual(sum(body.occupancy), len(body))
+
+    def test_overlapping_segments_are_counted(self):
+        """Test a cell holding two segments stays occupied after one leaves."""
+        body = SnakeBody([(5, 5), (5, 5)])
+        self.assertEqual(body.count((5, 5)), 2)
+        body.pop_tail()
+        self.assertIn((5, 5), body)
+
+    def test_ring_buffer_wraps_around(self):
+        """Test the body stays in order as the ring buffer wraps many times."""
+        body = SnakeBody([(0, 0), (1, 0)], width=2, height=2)
+        cells = [(0, 1), (1, 1), (1, 0), (0, 0)]
+        for step in range(10):
+            body.push_head(cells[step % 4])
+            body.pop_tail()
+            self.assertEqual(body, [cells[step % 4], cells[(step - 1) % 4]])
+            self.assertEqual(body[-1], cells[(step - 1) % 4])
+            self.assertEqual(body[:1], [cells[step % 4]])
+        self.assertEqual(body.capacity, 4)
+
+    def test_full_board(self):
+        """Test a snake can fill every cell and still grows past overlaps."""
+        body = SnakeBody([(0, 0)], width=2, height=2)
+        for cell in [(1, 0), (1, 1), (0, 1)]:
+            body.push_head(cell)
+        self.assertEqual(len(body), body.capacity)
+        body.push_head((0, 0))
+        self.assertEqual(len(body), 5)
+        self.assertEqual(body[0], (0, 0))
+        self.assertEqual(body[-1], (0, 0))
+        self.assertEqual(body.count((0, 0)), 2)
+
+    def test_out_of_grid_positions(self):
+        """Test positions off the board are never occupied."""
+        body = SnakeBody([(0, 0)])
+        self.assertNotIn((GRID_WIDTH, 0), body)
+        self.assertNotIn((-1, 0), body)
+
+    def test_self_collision_ignores_moving_tail(self):
+        """Test the head may move onto the cell the tail is leaving."""
+        snake = SnakeState([(1, 1), (2, 1), (2, 2), (1, 2)], DOWN)
+        self.assertFalse(advance_snake(snake, set(), 0))
+        snake = SnakeState([(1, 1), (2, 1), (2, 2), (1, 2), (1, 3)], DOWN)
+        self.assertTrue(advance_snake(snake, set(), 0))
+
+    def test_collision_cause(self):
+        """Test collisions report whether the snake hit an obstacle or itself."""
+        snake = SnakeState([(1, 1), (2, 1), (2, 2), (1, 2), (1, 3)], DOWN)
+        self.assertEqual(collision_cause(snake, (1, 2), set()), "self")
+        self.assertEqual(collision_cause(snake, (1, 0), {(1, 0)}), "obstacle")
+        self.assertIsNone(collision_cause(snake, (0, 1), set()))
+
+
+class TestGameCore(unittest.TestCase):
+    """Unit tests for the headless GameCore simulation."""
+
+    def test_reset(self):
+        """Test a new game starts with a snake, obstacles and food."""
+        core = GameCore(seed=0)
+        self.assertEqual(len(core.snake.positions), 3)
+        self.assertEqual(len(core.foods), core.max_foods)
+        self.assertTrue(core.obstacles)
+        self.assertEqual(core.score, 0)
+        self.assertFalse(core.game_over)
+
+    def test_seeded_games_are_deterministic(self):
+        """Test two cores with the same seed play the same game."""
+        first, second = GameCore(seed=42), GameCore(seed=42)
+        for _ in range(200):
+            self.assertEqual(first.step(), second.step())
+        self.assertEqual(first.snake.positions, second.snake.positions)
+
+    def test_eating_food(self):
+        """Test eating food scores points, grows the snake and respawns food."""
+        core = GameCore(seed=3)
+        head = core.snake.get_head_position()
+        target = move(head, core.snake.direction)
+        core.obstacles.discard(target)
+        core.foods = {target: "golden"}
+
+        result = core.step()
+
+        self.assertEqual(result, StepResult(food_type="golden"))
+        self.assertEqual(core.score, 2)
+        self.assertEqual(core.snake.length, 5)
+        self.assertEqual(len(core.foods), core.max_foods)
+
+    def test_obstacle_every_ten_points(self):
+        """Test reaching a multiple of ten adds an obstacle and speeds up."""
+        core = GameCore(seed=4)
+        core.score = 9
+        target = move(core.snake.get_head_position(), core.snake.direction)
+        core.obstacles.discard(target)
+        core.foods = {target: "normal"}
+        obstacle_count = len(core.obstacles)
+        speed = core.snake.speed
+
+        core.step()
+
+        self.assertEqual(len(core.obstacles), obstacle_count + 1)
+        self.assertEqual(core.snake.speed, speed + 1)
+
+    def test_obstacles_assigned_from_themselves(self):
+        """Test assigning obstacles built from the current ones keeps them and their cells."""
+        core = GameCore(seed=6)
+        obstacles = set(core.obstacles)
+        core.obstacles = core.obstacles
+        self.assertEqual(core.obstacles, obstacles)
+        core.obstacles |= {(0, 0)}
+        self.assertEqual(core.obstacles, obstacles | {(0, 0)})
+        core.obstacles = (pos for pos in core.obstacles if pos != (0, 0))
+        self.assertEqual(core.obstacles, obstacles)
+        self.assertFalse(any(pos in core.free_cells for pos in core.obstacles))
+        self.assertIn((0, 0), core.free_cells)
+
+    def test_turn_rejects_reversal(self):
+        """Test the snake cannot reverse onto itself."""
+        core = GameCore(seed=5)
+        core.snake.direction = RIGHT
+        core.turn(LEFT)
+        self.assertEqual(core.snake.direction, RIGHT)
+        core.turn(UP)
+        self.assertEqual(core.snake.direction, UP)
+
+    def test_game_over_is_sticky(self):
+        """Test stepping after game over does nothing."""
+        core = GameCore(seed=6)
+        target = move(core.snake.get_head_position(), core.snake.direction)
+        core.obstacles.add(target)
+        self.assertTrue(core.step().game_over)
+        ticks = core.ticks
+        self.assertTrue(core.step().game_over)
+        self.assertEqual(core.ticks, ticks)
@@ -1,6 +1,7 @@
 import pygame
 from tests.test_base import SnakeGameTest
-from src import Food
+from src import Food, Obstacle, Snake, GRID_WIDTH, GRID_HEIGHT
+from src.food import FOOD_EMOJIS, EMOJI_SIZE, get_emoji, preload_emojis, _emoji_cache
 
 
 class TestFood(SnakeGameTest):
@@ -46,3 +47,50 @@ class TestFood(SnakeGameTest):
 
         # Verify that at least some positions are different
         self.assertTrue(initial_positions != new_positions)
+
+    def test_food_avoids_snake(self):
+        """Test food never spawns on a snake sharing the free-cell index."""
+        obstacles = Obstacle()
+        snake = Snake(obstacles.free_cells)
+        for _ in range(20):
+            food = Food(obstacles)
+            for food_item in food.foods:
+                self.assertNotIn(food_item.position, snake.positions)
+                self.assertNotIn(food_item.position, obstacles.positions)
+            food.foods = []
+
+    def test_food_on_full_board(self):
+        """Test food stops spawning cleanly when no cell is free."""
+        self.obstacles.positions = {(x, y) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT) if (x, y) != (0, 0)}
+        food = Food(self.obstacles)
+        self.assertEqual([food_item.position for food_item in food.foods], [(0, 0)])
+
+        self.obstacles.positions.add((0, 0))
+        food.foods = []
+        food._ensure_minimum_food()  # pylint: disable=protected-access
+        self.assertEqual(food.foods, [])
+
+    def test_emoji_cache(self):
+        """Test food reuses cached emoji surfaces instead of rasterizing per spawn."""
+        food = Food(Obstacle())
+        for item in food.foods:
+            self.assertIs(item.emoji_surface, get_emoji(item.emoji))
+        self.assertIsNot(get_emoji("🍕", (10, 10)), get_emoji("🍕"))
+
+    def test_preload_emojis_in_background(self):
+        """Test preloading fills the cache with every food emoji."""
+        _emoji_cache.clear()
+        thread = preload_emojis(background=True)
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        for emojis in FOOD_EMOJIS.values():
+            for emoji in emojis:
+                self.assertIn((emoji, EMOJI_SIZE), _emoji_cache)
+
+    def test_eaten_food_is_counted(self):
+        """Test food tracks how many of each type the snake has eaten."""
+        food = Food(Obstacle())
+        eaten = food.foods[0]
+        food.check_collision(eaten.position)
+        self.assertEqual(food.eaten, {eaten.type: 1})
+        self.assertEqual(food.last_eaten, eaten.type)
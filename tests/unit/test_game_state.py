@@ -1,4 +1,5 @@
 import unittest
+import unittest.mock
 import os
 from src.game_state import GameState
 
@@ -124,3 +125,31 @@ class TestGameState(unittest.TestCase):
 
         # Clean up
         os.remove("high_score.txt")
+
+    def test_high_score_written_behind(self):
+        """Test scoring only marks the high score dirty and the save happens at game end."""
+        self.game_state.start_game()
+        self.game_state.update_score(5)
+        self.assertTrue(self.game_state.high_score_dirty)
+        self.assertFalse(os.path.exists("high_score.txt"))
+
+        self.game_state.end_game()
+        self.assertFalse(self.game_state.high_score_dirty)
+        self.assertEqual(GameState().high_score, 5)
+
+        with unittest.mock.patch.object(self.game_state, "save_high_score") as save:
+            self.game_state.flush_high_score()
+        save.assert_not_called()
+
+    def test_failed_save_keeps_previous_file(self):
+        """Test a save that fails part way leaves the old high score intact."""
+        self.game_state.high_score = 10
+        self.game_state.save_high_score()
+
+        self.game_state.update_score(20)
+        with unittest.mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertLogs(level="ERROR"):
+                self.game_state.flush_high_score()
+        self.assertTrue(self.game_state.high_score_dirty)
+        self.assertFalse(os.path.exists("high_score.txt.tmp"))
+        self.assertEqual(GameState().high_score, 10)
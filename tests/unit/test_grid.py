@@ -0,0 +1,136 @@
+import random
+import unittest
+from src.grid import FreeCells, CellSet, SnakeBody
+
+
+class TestFreeCells(unittest.TestCase):
+    """Unit tests for the free-cell index."""
+
+    def setUp(self):
+        """Set up a small board before each test."""
+        self.free_cells = FreeCells(4, 3)
+
+    def test_block_and_unblock(self):
+        """Test blocking removes a cell and unblocking returns it."""
+        self.assertEqual(len(self.free_cells), 12)
+        self.free_cells.block((1, 1))
+        self.assertNotIn((1, 1), self.free_cells)
+        self.assertEqual(len(self.free_cells), 11)
+        self.free_cells.unblock((1, 1))
+        self.assertIn((1, 1), self.free_cells)
+        self.assertEqual(len(self.free_cells), 12)
+
+    def test_shared_cells_need_every_blocker_released(self):
+        """Test a cell blocked twice stays taken until both release it."""
+        self.free_cells.block((2, 2))
+        self.free_cells.block((2, 2))
+        self.free_cells.unblock((2, 2))
+        self.assertNotIn((2, 2), self.free_cells)
+        self.free_cells.unblock((2, 2))
+        self.assertIn((2, 2), self.free_cells)
+
+    def test_choice_only_returns_free_cells(self):
+        """Test sampling never returns a blocked cell and reports a full board."""
+        rng = random.Random(0)
+        for x in range(4):
+            for y in range(3):
+                if (x, y) != (3, 0):
+                    self.free_cells.block((x, y))
+        for _ in range(20):
+            self.assertEqual(self.free_cells.choice(rng), (3, 0))
+        self.free_cells.block((3, 0))
+        self.assertIsNone(self.free_cells.choice(rng))
+
+    def test_off_board_positions_are_ignored(self):
+        """Test blocking positions off the board changes nothing."""
+        self.free_cells.block((4, 0))
+        self.free_cells.unblock((-1, 0))
+        self.assertEqual(len(self.free_cells), 12)
+
+
+class TestCellSet(unittest.TestCase):
+    """Unit tests for sets that block cells in a FreeCells index."""
+
+    def test_set_operations_update_index(self):
+        """Test add, discard, clear and update keep the index in step."""
+        free_cells = FreeCells(4, 3)
+        cells = CellSet([(0, 0), (1, 0)], free_cells)
+        self.assertEqual(len(free_cells), 10)
+        cells.add((0, 0))
+        self.assertEqual(len(free_cells), 10)
+        cells.discard((0, 0))
+        self.assertIn((0, 0), free_cells)
+        cells.update({(2, 2), (3, 2)})
+        self.assertEqual(len(free_cells), 9)
+        cells.clear()
+        self.assertEqual(len(free_cells), 12)
+        with self.assertRaises(KeyError):
+            cells.remove((0, 0))
+
+    def test_in_place_operators_update_index(self):
+        """Test the in-place operators and *_update methods keep the index and version in step."""
+        free_cells = FreeCells(4, 3)
+        cells = CellSet([(0, 0), (1, 0)], free_cells)
+        version = cells.version
+
+        cells |= {(2, 0)}
+        self.assertEqual(len(free_cells), 9)
+        cells -= {(0, 0)}
+        self.assertIn((0, 0), free_cells)
+        cells &= {(1, 0), (3, 2)}
+        self.assertEqual(cells, {(1, 0)})
+        self.assertIn((2, 0), free_cells)
+        cells ^= {(1, 0), (3, 2)}
+        self.assertEqual(cells, {(3, 2)})
+        self.assertIn((1, 0), free_cells)
+        self.assertNotIn((3, 2), free_cells)
+        self.assertIsInstance(cells, CellSet)
+        self.assertGreater(cells.version, version)
+
+        cells.update([(0, 1), (1, 1)])
+        cells.difference_update([(0, 1)])
+        cells.intersection_update([(1, 1), (3, 2)], [(1, 1)])
+        self.assertEqual(cells, {(1, 1)})
+        cells.symmetric_difference_update([(1, 1), (2, 2)])
+        self.assertEqual(cells, {(2, 2)})
+        self.assertEqual(len(free_cells), 11)
+        self.assertNotIn((2, 2), free_cells)
+
+    def test_operators_with_itself(self):
+        """Test combining a set with itself in place leaves the index consistent."""
+        free_cells = FreeCells(4, 3)
+        cells = CellSet([(0, 0), (1, 0)], free_cells)
+        cells |= cells
+        cells &= cells
+        self.assertEqual(cells, {(0, 0), (1, 0)})
+        self.assertEqual(len(free_cells), 10)
+        cells -= cells
+        self.assertEqual(len(free_cells), 12)
+        cells.update([(0, 0)])
+        cells ^= cells
+        self.assertFalse(cells)
+        self.assertEqual(len(free_cells), 12)
+
+    def test_version_counts_changes(self):
+        """Test version moves on every change and only on changes."""
+        cells = CellSet([(0, 0)])
+        version = cells.version
+        cells.add((0, 0))
+        cells.discard((5, 5))
+        self.assertEqual(cells.version, version)
+        cells.add((1, 1))
+        self.assertGreater(cells.version, version)
+        version = cells.version
+        cells.pop()
+        self.assertGreater(cells.version, version)
+
+    def test_snake_body_blocks_cells(self):
+        """Test the snake body blocks the cells it moves through."""
+        free_cells = FreeCells(4, 3)
+        body = SnakeBody([(1, 1), (0, 1)], 4, 3, free_cells)
+        body.push_head((2, 1))
+        body.pop_tail()
+        self.assertNotIn((2, 1), free_cells)
+        self.assertIn((0, 1), free_cells)
+        body.release()
+        self.assertEqual(len(free_cells), 12)
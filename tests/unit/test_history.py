@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from src.history import Run, RunHistory
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "runs.db")
+        self.history = RunHistory(self.path)
+
+    def tearDown(self):
+        self.history.close()
+        self.directory.cleanup()
+
+    def test_uses_wal_mode(self):
+        """Test the database is in WAL mode so readers don't block the game."""
+        self.assertEqual(self.history.connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_record_and_rank_runs(self):
+        """Test runs round-trip with their food counts and rank by score, then duration."""
+        runs = [
+            Run(score=5, duration_ms=9000, max_length=8, death_cause="self", seed=1, food_eaten={"normal": 3, "golden": 1}),
+            Run(score=12, duration_ms=30000, max_length=15, death_cause="obstacle", seed=2, food_eaten={"speed": 2, "slow": 0}),
+            Run(score=5, duration_ms=7000, max_length=8),
+        ]
+        self.assertTrue(self.history.record_runs(runs))
+
+        top = self.history.top_runs(2)
+        self.assertEqual([(run.score, run.duration_ms) for run in top], [(12, 30000), (5, 7000)])
+        self.assertEqual(top[0].food_eaten, {"speed": 2})
+        self.assertEqual(top[0].death_cause, "obstacle")
+        self.assertEqual(self.history.recent_runs(1)[0].played_at, max(run.played_at for run in runs))
+
+    def test_runs_written_in_one_transaction(self):
+        """Test a batch that fails part way stores none of its runs."""
+        runs = [Run(score=1, duration_ms=100, max_length=3), Run(score=None, duration_ms=100, max_length=3)]
+        with self.assertLogs(level="ERROR"):
+            self.assertFalse(self.history.record_runs(runs))
+        self.assertEqual(self.history.top_runs(), [])
+
+    def test_top_runs_use_score_index(self):
+        """Test top-N queries are answered from the score index."""
+        plan = self.history.connection.execute("EXPLAIN QUERY PLAN SELECT id FROM runs ORDER BY score DESC, duration_ms LIMIT 10").fetchall()
+        self.assertIn("runs_by_score", " ".join(row[-1] for row in plan))
+
+    def test_reader_not_blocked_by_open_write(self):
+        """Test a reporting connection reads committed runs while a write is in progress."""
+        self.history.record_run(Run(score=3, duration_ms=100, max_length=4))
+        reader = sqlite3.connect(self.path, timeout=0)
+        try:
+            self.history.connection.execute("INSERT INTO runs (played_at, score, duration_ms, max_length) VALUES (0, 9, 1, 3)")
+            self.assertEqual(reader.execute("SELECT score FROM runs").fetchall(), [(3,)])
+            self.history.connection.commit()
+            self.assertEqual(len(reader.execute("SELECT score FROM runs").fetchall()), 2)
+        finally:
+            reader.close()
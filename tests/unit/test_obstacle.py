@@ -138,3 +138,42 @@ class TestObstacle(SnakeGameTest):
                 center_positions.add((x, y))
 
         self.assertTrue(center_positions.isdisjoint(self.obstacles.positions))
+
+    def test_obstacle_layer_rebuilt_only_on_change(self):
+        """Test obstacles are composited once and redrawn only when they change."""
+        background = pygame.Surface((800, 600))
+        layer = self.obstacles.composite(background)
+        self.assertIs(self.obstacles.composite(background), layer)
+        pos = next(iter(self.obstacles.positions))
+        pixel = (pos[0] * GRID_SIZE + GRID_SIZE // 2, pos[1] * GRID_SIZE + GRID_SIZE // 2)
+        self.assertEqual(layer.get_at(pixel), self.obstacles.color)
+        self.assertEqual(background.get_at(pixel), (0, 0, 0, 255))
+
+        self.obstacles.positions.add((0, 0))
+        updated = self.obstacles.composite(background)
+        self.assertIsNot(updated, layer)
+        self.assertEqual(updated.get_at((GRID_SIZE // 2, GRID_SIZE // 2)), self.obstacles.color)
+
+    def test_positions_assigned_from_themselves(self):
+        """Test assigning positions built from the current ones keeps them and their cells."""
+        self.obstacles.positions = {(1, 1), (2, 2)}
+        self.obstacles.positions = self.obstacles.positions
+        self.assertEqual(self.obstacles.positions, {(1, 1), (2, 2)})
+        self.obstacles.positions |= {(3, 3)}
+        self.obstacles.positions -= {(1, 1)}
+        self.assertEqual(self.obstacles.positions, {(2, 2), (3, 3)})
+        self.obstacles.positions = (pos for pos in self.obstacles.positions if pos != (3, 3))
+        self.assertEqual(self.obstacles.positions, {(2, 2)})
+        self.assertNotIn((2, 2), self.obstacles.free_cells)
+        self.assertIn((1, 1), self.obstacles.free_cells)
+        self.assertIn((3, 3), self.obstacles.free_cells)
+
+    def test_obstacle_render_reports_each_obstacle(self):
+        """Test rendering from the cached layer reports every obstacle's area."""
+        screen = pygame.Surface((800, 600))
+        self.obstacles.positions = {(1, 1), (10, 12)}
+        rects = self.obstacles.render(screen)
+        self.assertEqual(sorted(rect.topleft for rect in rects), [(GRID_SIZE, GRID_SIZE), (10 * GRID_SIZE, 12 * GRID_SIZE)])
+        self.assertEqual(screen.get_at((5 * GRID_SIZE, 5 * GRID_SIZE)), (0, 0, 0, 255))
+        self.obstacles.positions.clear()
+        self.assertEqual(self.obstacles.render(screen), [])
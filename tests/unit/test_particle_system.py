@@ -0,0 +1,116 @@
+import unittest
+from unittest import mock
+import pygame
+from src.particle_system import ParticleSystem, ParticleAtlas, ALPHA_LEVELS, PARTICLE_SIZES
+
+
+class TestParticleSystem(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def setUp(self):
+        self.particle_system = ParticleSystem()
+
+    def test_emit_grows_arrays(self):
+        """Test emitting more particles than fit grows the arrays."""
+        self.particle_system.emit(100, 100, (255, 0, 0), count=ParticleSystem.initial_capacity + 1)
+        self.particle_system.emit(100, 100, (0, 255, 0), count=5)
+        self.assertEqual(len(self.particle_system), ParticleSystem.initial_capacity + 6)
+        self.assertGreaterEqual(self.particle_system.capacity, len(self.particle_system))
+        self.assertEqual(self.particle_system.palette, [(255, 0, 0), (0, 255, 0)])
+        for particle in self.particle_system.particles:
+            self.assertTrue(3 <= particle.size <= 6)
+            self.assertTrue(0.8 <= particle.lifetime <= 1.2)
+
+    def test_update_moves_and_fades(self):
+        """Test particles move, fall and fade as they age."""
+        self.particle_system.emit(100, 100, (255, 0, 0), count=10)
+        for particle in self.particle_system.particles:
+            particle.birth_time = pygame.time.get_ticks() - 400
+        self.particle_system.update()
+        self.assertEqual(len(self.particle_system), 10)
+        for particle in self.particle_system.particles:
+            self.assertNotEqual((particle.x, particle.y), (100, 100))
+            self.assertTrue(0 < particle.alpha < 255)
+
+    def test_motion_independent_of_frame_rate(self):
+        """Test particles cover the same distance whether updated at 6 or 60 frames a second."""
+        slow, fast = ParticleSystem(), ParticleSystem()
+        with mock.patch("pygame.time.get_ticks", return_value=1000):
+            slow.emit(100, 100, (255, 0, 0), count=10)
+            fast.emit(100, 100, (255, 0, 0), count=10)
+        fast.vx[:10], fast.vy[:10], fast.lifetime[:10] = slow.vx[:10], slow.vy[:10], slow.lifetime[:10]
+        for frame in range(1, 4):
+            with mock.patch("pygame.time.get_ticks", return_value=1000 + frame * 500 // 3):
+                slow.update()
+        for frame in range(1, 31):
+            with mock.patch("pygame.time.get_ticks", return_value=1000 + frame * 500 // 30):
+                fast.update()
+        for moved_slowly, moved_fast in zip(slow.particles, fast.particles):
+            self.assertAlmostEqual(moved_slowly.x, moved_fast.x, delta=1)
+            self.assertAlmostEqual(moved_slowly.y, moved_fast.y, delta=1)
+            self.assertLess(abs(moved_fast.x - 100), 20)
+
+    def test_update_compacts_dead_particles(self):
+        """Test expired particles are dropped and the survivors keep their data."""
+        self.particle_system.emit(100, 100, (255, 0, 0), count=4)
+        self.particle_system.emit(300, 300, (0, 0, 255), count=4)
+        for particle in self.particle_system.particles[:4]:
+            particle.birth_time = pygame.time.get_ticks() - 2000
+        self.particle_system.update()
+        self.assertEqual(len(self.particle_system), 4)
+        for particle in self.particle_system.particles:
+            self.assertGreater(particle.x, 200)
+
+    def test_render(self):
+        """Test rendering draws visible particles and reports their areas."""
+        screen = pygame.Surface((400, 400))
+        self.assertEqual(self.particle_system.render(screen), [])
+        self.particle_system.emit(200, 200, (255, 0, 0), count=20)
+        rects = self.particle_system.render(screen)
+        self.assertEqual(len(rects), 20)
+        self.assertEqual(screen.get_at((200, 200))[:3], (255, 0, 0))
+
+    def test_bounds_cover_rendered_particles(self):
+        """Test the bounds enclose every area render reports."""
+        self.assertIsNone(self.particle_system.bounds())
+        self.particle_system.emit(100, 100, (255, 0, 0), count=10)
+        self.particle_system.emit(250, 50, (0, 255, 0), count=10)
+        self.particle_system.update()
+        bounds = self.particle_system.bounds()
+        rects = self.particle_system.render(pygame.Surface((400, 400)))
+        self.assertEqual(bounds, rects[0].unionall(rects))
+
+    def test_render_skips_faded_particles(self):
+        """Test particles faded below the lowest alpha level are not drawn."""
+        self.particle_system.emit(200, 200, (255, 0, 0), count=5)
+        self.particle_system.alpha[:5] = [0, 1, 128, 200, 255]
+        rects = self.particle_system.render(pygame.Surface((400, 400)))
+        self.assertEqual(len(rects), 3)
+
+
+class TestParticleAtlas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def test_sprites_baked_once_per_color(self):
+        """Test a color's sprites cover every size and alpha level and are reused."""
+        atlas = ParticleAtlas()
+        table = atlas.sprites([10, 20, 30])
+        self.assertIs(atlas.sprites((10, 20, 30)), table)
+        self.assertEqual(sorted(table), list(PARTICLE_SIZES))
+        for size, sprites in table.items():
+            self.assertEqual(len(sprites), ALPHA_LEVELS)
+            self.assertEqual(sprites[0].get_size(), (size * 2, size * 2))
+        self.assertEqual(tuple(table[4][0].get_at((4, 4))), (10, 20, 30, 0))
+        self.assertEqual(tuple(table[4][-1].get_at((4, 4))), (10, 20, 30, 255))
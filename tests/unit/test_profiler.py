@@ -0,0 +1,64 @@
+import time
+import unittest
+from src.profiler import FrameProfiler, percentile
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = FrameProfiler(window=10)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test spans are a shared no-op while the profiler is off."""
+        self.assertIs(self.profiler.span("snake"), self.profiler.span("food"))
+        self.profiler.begin_frame()
+        with self.profiler.span("snake"):
+            pass
+        self.profiler.end_frame()
+        self.assertEqual(self.profiler.percentiles(), {})
+
+    def test_spans_sum_over_a_frame(self):
+        """Test a span entered several times in a frame records its total, and the frame its duration."""
+        self.profiler.toggle()
+        self.profiler.begin_frame()
+        for _ in range(2):
+            with self.profiler.span("particles"):
+                time.sleep(0.002)
+        self.profiler.end_frame()
+        report = self.profiler.percentiles()
+        self.assertGreaterEqual(report["particles"][0], 4)
+        self.assertGreaterEqual(report["frame"][0], report["particles"][0])
+
+    def test_missing_spans_record_zero_and_window_rolls(self):
+        """Test frames without a span count as zero, and only the last window frames are kept."""
+        self.profiler.toggle()
+        with self.profiler.span("update"):
+            time.sleep(0.001)
+        self.profiler.end_frame()
+        for _ in range(9):
+            self.profiler.end_frame()
+        self.assertEqual(self.profiler.percentiles()["update"][0], 0)
+        self.assertGreater(self.profiler.percentiles()["update"][2], 0)
+
+        self.profiler.end_frame()  # Pushes the only nonzero sample out of the window
+        self.assertEqual(self.profiler.percentiles()["update"], (0, 0, 0))
+
+    def test_toggle_starts_over(self):
+        """Test turning the profiler off and on drops old samples."""
+        self.profiler.toggle()
+        with self.profiler.span("hud"):
+            pass
+        self.profiler.end_frame()
+        self.profiler.toggle()
+        self.profiler.toggle()
+        self.assertEqual(self.profiler.percentiles(), {})
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(100))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+import unittest
+import pygame
+from src.recorder import FrameRecorder, PARENT_CHECK_SECONDS
+
+
+def _record_and_vanish(path, encoder_pid):
+    """Start a recorder, report its encoder's pid and exit without closing it."""
+    recorder = FrameRecorder(path, (8, 8), "raw")
+    encoder_pid.value = recorder._encoder.pid  # pylint: disable=protected-access
+    os._exit(0)  # pylint: disable=protected-access
+
+
+def _running(pid):
+    """Whether pid is a live process, not counting zombies."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestFrameRecorder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "recording")
+        self.screen = pygame.Surface((64, 48))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, record_format, count):
+        recorder = FrameRecorder(self.path, self.screen.get_size(), record_format, fps=60)
+        captured = []
+        for frame in range(count):
+            self.screen.fill((frame, 255 - frame, 7))
+            if recorder.capture(self.screen):
+                captured.append(frame)
+        stats = recorder.close()
+        return captured, stats
+
+    def test_raw_frames_written_in_order(self):
+        """Test raw recordings hold every captured frame, in order."""
+        captured, stats = self.record("raw", 20)
+        self.assertEqual(stats["frames"] + stats["dropped"], 20)
+        self.assertEqual(stats["encoded"], stats["frames"])
+        frame_bytes = 64 * 48 * 3
+        with open(os.path.join(self.path, "frames.rgb"), "rb") as f:
+            data = f.read()
+        self.assertEqual(len(data), frame_bytes * len(captured))
+        for i, frame in enumerate(captured):
+            self.assertEqual(tuple(data[i * frame_bytes : i * frame_bytes + 3]), (frame, 255 - frame, 7))
+
+    def test_png_sequence_and_metadata(self):
+        """Test PNG recordings decode to the captured frames and record their metrics."""
+        captured, stats = self.record("png", 5)
+        for i, frame in enumerate(captured):
+            image = pygame.image.load(os.path.join(self.path, f"frame_{i:06d}.png"))
+            self.assertEqual(image.get_at((10, 10))[:3], (frame, 255 - frame, 7))
+        with open(os.path.join(self.path, "recording.json"), encoding="utf-8") as f:
+            metadata = json.load(f)
+        self.assertEqual((metadata["width"], metadata["height"], metadata["format"]), (64, 48, "png"))
+        self.assertEqual(metadata["encoded"], stats["encoded"])
+        self.assertLessEqual(stats["max_backlog"], FrameRecorder.slots)
+
+    def test_unknown_format(self):
+        """Test an unknown record format is rejected up front."""
+        with self.assertRaises(ValueError):
+            FrameRecorder(self.path, (8, 8), "gif")
+
+    def test_encoder_ends_on_sigterm(self):
+        """Test SIGTERM stops the encoder even though it was forked after pygame.init()."""
+        recorder = FrameRecorder(self.path, (8, 8), "raw")
+        encoder = recorder._encoder  # pylint: disable=protected-access
+        recorder.capture(pygame.Surface((8, 8)))
+        while recorder.stats()["encoded"] < 1:  # The encoder has set up its signal handlers
+            time.sleep(0.01)
+        os.kill(encoder.pid, signal.SIGTERM)
+        encoder.join(timeout=5)
+        self.assertFalse(encoder.is_alive())
+        self.assertEqual(encoder.exitcode, -signal.SIGTERM)
+        recorder.close()
+
+    @unittest.skipUnless(os.path.exists("/proc/self/stat"), "needs /proc to see the orphaned encoder")
+    def test_encoder_ends_with_game_process(self):
+        """Test the encoder exits on its own when the game dies without closing the recorder."""
+        context = multiprocessing.get_context()
+        encoder_pid = context.Value("i", 0)
+        game = context.Process(target=_record_and_vanish, args=(self.path, encoder_pid))
+        game.start()
+        game.join(timeout=5)
+        encoder_pid = encoder_pid.value
+        self.assertTrue(encoder_pid)
+        deadline = time.monotonic() + 10 * PARENT_CHECK_SECONDS
+        while _running(encoder_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(_running(encoder_pid))
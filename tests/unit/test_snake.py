@@ -1,5 +1,5 @@
 import pygame
-from src import GRID_WIDTH, GRID_HEIGHT, LEFT, RIGHT, GRID_SIZE
+from src import GRID_WIDTH, GRID_HEIGHT, LEFT, RIGHT, UP, GRID_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT
 from tests.test_base import SnakeGameTest
 
 
@@ -64,6 +64,72 @@ class TestSnake(SnakeGameTest):
         for color in self.snake.effects.gradient_colors:
             self.assertIn(color, self.snake.cached_segment_surfaces)
 
+    def test_particles_composited_only_where_present(self):
+        """Test the particle surface is skipped when empty and cleared after particles die."""
+        screen = pygame.Surface((GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE))
+        drawn = len(self.snake.render(screen))  # Body layer and head only
+
+        self.snake.particle_system.emit(100, 100, (255, 0, 0), count=10)
+        rects = self.snake.render(screen)
+        self.assertEqual(len(rects), drawn + 1)
+        self.assertTrue(rects[0].collidepoint(100, 100))
+
+        self.snake.particle_system.birth_time[:] -= 5000  # Expire every particle
+        self.assertEqual(len(self.snake.render(screen)), drawn)
+        self.assertEqual(self.snake.particle_surface.get_bounding_rect().size, (0, 0))
+
+    def test_incremental_body_matches_full_redraw(self):
+        """Test the incrementally updated body layer matches drawing every segment."""
+        self.obstacles.positions.clear()
+        self.snake.positions = [(5, 5), (4, 5), (3, 5)]
+        self.snake.direction = RIGHT
+
+        def body_pixels(layer):
+            surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            surface.blit(layer, (0, 0))
+            return pygame.image.tobytes(surface, "RGB")
+
+        def expected_body():
+            surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+            colors = self.snake.effects.gradient_colors
+            for i, pos in enumerate(self.snake.positions):
+                if i:
+                    surface.blit(self.snake.cached_segment_surfaces[colors[i * len(colors) // len(self.snake.positions)]], (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE))
+            return surface
+
+        screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        for tick in range(40):
+            if tick % 3 == 0:
+                self.snake.length += 2
+            if tick == 12:
+                self.snake.direction = UP
+            if tick == 22:
+                self.snake.direction = LEFT
+            if tick == 25:
+                self.snake.effects.gradient_colors = [(200, 0, 0), (0, 0, 200)]
+                self.snake._create_cached_segments()  # pylint: disable=protected-access
+            self.assertFalse(self.snake.update(self.obstacles))
+            self.snake.render(screen)
+            self.assertEqual(body_pixels(self.snake.body_layer), body_pixels(expected_body()))
+
+        # Replacing the body redraws the layer from scratch
+        self.snake.positions = [(1, 1), (1, 2)]
+        self.snake.render(screen)
+        self.assertEqual(body_pixels(self.snake.body_layer), body_pixels(expected_body()))
+
+    def test_head_interpolation(self):
+        """Test the head is drawn partway between its previous and current cell."""
+        self.snake = self.create_test_snake_at((10, 10), RIGHT)
+        self.snake.interpolation = 0.25
+        self.assertEqual(self.snake._head_render_position(), (10 * GRID_SIZE - 30, 10 * GRID_SIZE))
+        self.snake.interpolation = 1.0
+        self.assertEqual(self.snake._head_render_position(), (10 * GRID_SIZE, 10 * GRID_SIZE))
+
+        # No sliding across the board when the head wraps around
+        self.snake = self.create_test_snake_at((0, 10), RIGHT)
+        self.snake.interpolation = 0.25
+        self.assertEqual(self.snake._head_render_position(), (0, 10 * GRID_SIZE))
+
     def test_snake_effects_timing(self):
         """Test snake effects timing system."""
         # Store initial speed and set up effect
@@ -1,11 +1,14 @@
+import sqlite3
 import unittest.mock
 import pytest
 import pygame
-from snake_game import handle_direction_change, update_game_state, GameState
+from snake_game import FixedTimestep, handle_direction_change, update_game_state, record_run, shutdown, GameState
 from src.snake import Snake
 from src.obstacle import Obstacle
 from src.food import Food
 from src.sound import SoundManager
+from src.history import RunHistory
+from src import MIN_SPEED
 
 
 # pylint: disable=redefined-outer-name
@@ -47,6 +50,58 @@ class TestHandleDirectionChange:
             assert snake.direction == initial_direction
 
 
+class TestFixedTimestep:
+    def test_ticks_released_at_game_speed(self):
+        timestep = FixedTimestep()
+        tick_ms = 1000 / 6
+        ticks = 0
+        for _ in range(60):  # One second of 60 FPS frames
+            timestep.add(1000 / 60)
+            while timestep.consume(tick_ms):
+                ticks += 1
+        assert ticks == 6
+
+    def test_interpolation(self):
+        timestep = FixedTimestep()
+        timestep.add(50)
+        assert timestep.interpolation(100) == 0.5
+        timestep.add(100)
+        assert timestep.consume(100)
+        assert timestep.interpolation(100) == 0.5
+
+    def test_stall_is_capped(self):
+        timestep = FixedTimestep()
+        timestep.add(10000)
+        ticks = 0
+        while timestep.consume(100):
+            ticks += 1
+        assert ticks == FixedTimestep.max_frame_ms // 100
+
+    def test_slow_ticks_longer_than_stall_cap(self):
+        for speed in range(MIN_SPEED, 7):
+            tick_ms = 1000 / speed
+            timestep = FixedTimestep()
+            ticks = 0
+            for _ in range(600):  # 10 seconds at 60 FPS
+                timestep.add(1000 / 60, tick_ms)
+                while timestep.consume(tick_ms):
+                    ticks += 1
+            assert ticks >= 10 * speed - 1
+
+        timestep = FixedTimestep()
+        timestep.add(10000, 1000 / MIN_SPEED)
+        ticks = 0
+        while timestep.consume(1000 / MIN_SPEED):
+            ticks += 1
+        assert ticks == 2
+
+    def test_reset(self):
+        timestep = FixedTimestep()
+        timestep.add(90)
+        timestep.reset()
+        assert not timestep.consume(1)
+
+
 class TestUpdateGameState:
     @pytest.fixture
     def snake(self):
@@ -108,3 +163,27 @@ class TestUpdateGameState:
         update_game_state(snake, obstacles, food, sound_manager, game_state)
         obstacles.add_obstacle.assert_called_once()
         assert snake.speed == initial_speed + 1
+
+    def test_run_recorded_at_game_end(self, snake, obstacles, food, game_state, tmp_path):
+        history = RunHistory(str(tmp_path / "runs.db"))
+        snake.positions = [(5, 5), (4, 5), (3, 5)]
+        snake.direction = (1, 0)
+        obstacles.positions = {(6, 5)}
+        food.foods = [food._create_food_item((2, 2))]  # pylint: disable=protected-access
+        food.check_collision((2, 2))
+        game_state.start_game()
+        game_state.update_score(1)
+        game_state.end_game()
+
+        record_run(history, game_state, snake, obstacles, food, seed=42)
+        [run] = history.top_runs()
+        assert (run.score, run.max_length, run.death_cause, run.seed) == (1, 3, "obstacle", 42)
+        assert sum(run.food_eaten.values()) == 1
+        history.close()
+
+    def test_shutdown_closes_history(self, game_state, tmp_path):
+        history = RunHistory(str(tmp_path / "runs.db"))
+        with unittest.mock.patch("pygame.quit"):
+            shutdown(game_state, history=history)
+        with pytest.raises(sqlite3.ProgrammingError):
+            history.top_runs()
@@ -1,7 +1,11 @@
 import os
+import tempfile
 import unittest
+import wave
+from unittest import mock
 import pygame
-from src.sound import SoundManager
+from src.sound import SoundManager, MIXER_SETTINGS, buffer_size
+from src.synth import synthesize
 
 
 class TestSoundManager(unittest.TestCase):
@@ -16,13 +20,27 @@ class TestSoundManager(unittest.TestCase):
         pygame.quit()
 
     def setUp(self):
-        """Set up test environment before each test."""
+        """Set up test environment before each test, with a short track as the background music."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        music_file = os.path.join(directory.name, "music.wav")
+        frequency, _, channels = MIXER_SETTINGS
+        with wave.open(music_file, "wb") as file:
+            file.setnchannels(channels)
+            file.setsampwidth(2)
+            file.setframerate(frequency)
+            file.writeframes(synthesize([{"wave": "sine", "hz": 220, "ms": 1000, "gain": 0.2}], frequency, channels).tobytes())
+        patcher = mock.patch.object(SoundManager, "music_file", music_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(pygame.mixer.music.unload)
+        self.addCleanup(pygame.mixer.music.stop)
         self.sound_manager = SoundManager()
 
     def test_sound_initialization(self):
         """Test sound system initialization."""
         sound_manager = SoundManager()
-        self.assertIsNotNone(sound_manager.background_channel)
+        self.assertEqual(len(sound_manager.channels), SoundManager.effect_channels)
         self.assertEqual(pygame.mixer.get_num_channels(), 8)
 
     def test_load_nonexistent_sound(self):
@@ -35,7 +53,8 @@ class TestSoundManager(unittest.TestCase):
         sound_manager = SoundManager()
 
         # Test background music volume
-        self.assertAlmostEqual(sound_manager.background_channel.get_volume(), 0.8, places=2)
+        sound_manager.play_background_music()
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(), 0.8, places=1)
 
         # Test eat sound volume
         if sound_manager.eat_sound:
@@ -45,11 +64,10 @@ class TestSoundManager(unittest.TestCase):
         """Test background music control."""
         # Test starting background music
         self.sound_manager.play_background_music()
-        channel = pygame.mixer.Channel(0)
-        self.assertTrue(channel.get_busy())
+        self.assertTrue(pygame.mixer.music.get_busy())
 
         # Test background music volume
-        self.assertAlmostEqual(channel.get_volume(), 0.8, places=1)
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(), 0.8, places=1)
 
     def test_background_music_controls(self):
         """Test background music control functions."""
@@ -57,14 +75,15 @@ class TestSoundManager(unittest.TestCase):
 
         # Test play
         sound_manager.play_background_music()
-        self.assertTrue(sound_manager.background_channel.get_busy())
+        self.assertTrue(pygame.mixer.music.get_busy())
 
         # Test pause
         sound_manager.pause_background_music()
+        self.assertFalse(pygame.mixer.music.get_busy())
 
         # Test resume
         sound_manager.resume_background_music()
-        self.assertTrue(sound_manager.background_channel.get_busy())
+        self.assertTrue(pygame.mixer.music.get_busy())
 
     def test_sound_effects(self):
         """Test sound effects playback."""
@@ -100,3 +119,73 @@ class TestSoundManager(unittest.TestCase):
 
         # Clean up
         os.remove("invalid.wav")
+
+    def test_mixer_reused_when_settings_match(self):
+        """Test a new SoundManager keeps a mixer already running at its settings."""
+        self.assertEqual(pygame.mixer.get_init(), MIXER_SETTINGS)
+        playing = self.sound_manager.eat_sound.play()
+        SoundManager()
+        self.assertTrue(playing.get_busy())
+
+    def test_effects_loaded_in_background(self):
+        """Test the background loader decodes every effect."""
+        sound_manager = SoundManager()
+        sound_manager.load_sounds(background=True).join()
+        self.assertEqual(set(sound_manager._sounds), set(SoundManager.effects))
+        self.assertAlmostEqual(sound_manager._sounds["crash"].get_volume(), 0.3, places=2)
+
+    def test_food_types_play_their_effects(self):
+        """Test eating plays the food type's effect, plus a speed cue for speed changes."""
+        pygame.mixer.stop()
+        self.sound_manager.play_eat_sound("golden")
+        self.assertEqual(sum(channel.get_busy() for channel in self.sound_manager.channels), 1)
+        pygame.mixer.stop()
+        self.sound_manager.play_eat_sound("slow")
+        self.assertEqual(sum(channel.get_busy() for channel in self.sound_manager.channels), 2)
+        self.assertEqual(self.sound_manager._voices[1][0], SoundManager.effects["slow_down"][1])
+
+    def test_buffer_size_fits_latency(self):
+        """Test the mixer buffer is the largest power of two within the latency budget."""
+        self.assertEqual(buffer_size(12), 512)
+        self.assertEqual(buffer_size(50), 2048)
+        self.assertEqual(buffer_size(1), 256)
+        sound_manager = SoundManager(latency_ms=25)
+        self.assertEqual(sound_manager.buffer_size, 1024)
+        self.assertLessEqual(sound_manager.buffer_ms, 25)
+
+    def test_effects_use_reserved_channels(self):
+        """Test effects play on the reserved channels and other sounds can't take them."""
+        channel = self.sound_manager.play_effect("eat:normal")
+        self.assertIn(channel, self.sound_manager.channels)
+
+        # Sound.play() skips the effect channels, and only those, so it takes the one after them
+        pygame.mixer.stop()
+        self.sound_manager.eat_sound.play()
+        self.assertFalse(any(channel.get_busy() for channel in self.sound_manager.channels))
+        self.assertTrue(pygame.mixer.Channel(SoundManager.effect_channels).get_busy())
+
+    def test_voice_stealing_by_priority(self):
+        """Test a full pool steals the oldest least important voice and drops less important effects."""
+        sound_manager = self.sound_manager
+        pygame.mixer.stop()  # Let earlier tests' sounds go
+        eaten = [sound_manager.play_effect("eat:normal") for _ in sound_manager.channels]
+        self.assertEqual(len(set(eaten)), len(sound_manager.channels))
+
+        # A crash cuts off the oldest eat sound
+        self.assertIs(sound_manager.play_effect("crash"), eaten[0])
+        self.assertEqual(sound_manager.stolen, 1)
+
+        # Fill the pool with crashes, then an eat sound has nowhere to go
+        for _ in sound_manager.channels[1:]:
+            sound_manager.play_effect("crash")
+        self.assertIsNone(sound_manager.play_effect("eat:normal"))
+        self.assertEqual(sound_manager.dropped, 1)
+
+    def test_latency_hook(self):
+        """Test the latency hook reports each effect with at least the buffer's latency."""
+        reports = []
+        sound_manager = SoundManager(latency_hook=lambda name, latency_ms: reports.append((name, latency_ms)))
+        sound_manager.play_crash_sound()
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0][0], "crash")
+        self.assertGreaterEqual(reports[0][1], sound_manager.buffer_ms)
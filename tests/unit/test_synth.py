@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import pygame
+from src import synth
+from src.constants import FOOD_TYPES
+from src.synth import TONES, effect_samples, effect_sound, food_effect, synthesize
+
+
+class TestSynth(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.mixer.init(44100, -16, 2)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.mixer.quit()
+
+    def test_every_food_type_has_a_distinct_effect(self):
+        """Test each food type has its own eat effect, and no two sound alike."""
+        names = [food_effect(food_type) for food_type in FOOD_TYPES]
+        for name in names:
+            self.assertIn(name, TONES)
+        samples = [effect_samples(name) for name in names]
+        for i, first in enumerate(samples):
+            for second in samples[i + 1 :]:
+                self.assertFalse(first.shape == second.shape and np.array_equal(first, second))
+
+    def test_samples_fit_the_mixer(self):
+        """Test effects are 16-bit, one column per mixer channel, and fade in and out."""
+        for name in TONES:
+            samples = effect_samples(name)
+            self.assertEqual(samples.dtype, np.int16)
+            self.assertEqual(samples.shape[1], 2)
+            self.assertGreater(np.abs(samples).max(), 1000)
+            self.assertLess(np.abs(samples[0]).max(), 100)
+            self.assertLess(np.abs(samples[-1]).max(), 100)
+
+    def test_samples_are_cached(self):
+        """Test an effect is synthesized once per mixer format."""
+        synth._samples.clear()
+        self.assertIs(effect_samples("crash"), effect_samples("crash"))
+        self.assertEqual(list(synth._samples), [("crash", 44100, 2)])
+
+    def test_effect_sound(self):
+        """Test an effect becomes a Sound of its length."""
+        sound = effect_sound("eat:golden")
+        self.assertAlmostEqual(sound.get_length(), TONES["eat:golden"][0]["ms"] / 1000, places=2)
+
+    def test_mono_and_unknown_waveform(self):
+        """Test mono samples are one-dimensional and unknown waveforms are rejected."""
+        self.assertEqual(synthesize(TONES["eat:normal"], 22050, 1).shape, (22050 * 90 // 1000,))
+        with self.assertRaises(ValueError):
+            synthesize([{"wave": "saw", "hz": 440, "ms": 10}], 22050, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 import os
+import threading
 import unittest
+import unittest.mock
 import pygame
 
 from src.ui import Screenshot, GameRenderer
-from src import WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND
+from src.profiler import profiler
+from src import Snake, Food, Obstacle, WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND, RIGHT, get_font
 
 
 class TestScreenshot(unittest.TestCase):
@@ -16,6 +19,7 @@ class TestScreenshot(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test."""
         pygame.quit()
+        self.screenshot.flush()
         # Clean up any screenshots
         if os.path.exists(self.screenshot.directory):
             for file in os.listdir(self.screenshot.directory):
@@ -50,6 +54,7 @@ class TestScreenshot(unittest.TestCase):
 
         # Update should capture the screenshot
         self.screenshot.update(self.screen)
+        self.screenshot.flush()
 
         # Check if a screenshot was saved
         screenshots = os.listdir(self.screenshot.directory)
@@ -57,6 +62,49 @@ class TestScreenshot(unittest.TestCase):
         self.assertTrue(screenshots[0].startswith("snake_"))
         self.assertTrue(screenshots[0].endswith(".png"))
 
+    def test_screenshots_in_same_second_get_distinct_names(self):
+        """Test back-to-back captures are all kept, pixel-for-pixel."""
+        self.screen.fill((10, 20, 30))
+        self.screen.fill((200, 100, 50), (0, 0, 5, 5))
+        for _ in range(3):
+            self.screenshot.capture(self.screen)
+        self.screenshot.flush()
+
+        screenshots = sorted(os.listdir(self.screenshot.directory))
+        self.assertEqual(len(screenshots), 3)
+        for name in screenshots:
+            image = pygame.image.load(os.path.join(self.screenshot.directory, name))
+            self.assertEqual(image.get_at((0, 0))[:3], (200, 100, 50))
+            self.assertEqual(image.get_at((WINDOW_WIDTH - 1, WINDOW_HEIGHT - 1))[:3], (10, 20, 30))
+
+    def test_captures_dropped_when_encoder_is_behind(self):
+        """Test captures beyond max_pending are dropped rather than blocking the frame."""
+        release = threading.Event()
+        with unittest.mock.patch("src.ui.encode_png", side_effect=lambda data, size: release.wait() and b""):
+            for _ in range(Screenshot.max_pending + 3):
+                self.screenshot.capture(self.screen)
+            self.assertGreaterEqual(self.screenshot.dropped, 2)
+            release.set()
+            self.screenshot.flush()
+
+    def test_encoder_survives_a_failed_screenshot(self):
+        """Test an unexpected error saving one screenshot doesn't stop later ones or hang flush."""
+        failures = iter([ValueError("bad frame")])
+
+        def encode(data, size):
+            for error in failures:
+                raise error
+            return b"png"
+
+        with self.assertLogs(level="ERROR"), unittest.mock.patch("src.ui.encode_png", side_effect=encode):
+            self.screenshot.capture(self.screen)
+            self.screenshot.capture(self.screen)
+            flushed = threading.Thread(target=self.screenshot.flush, daemon=True)
+            flushed.start()
+            flushed.join(timeout=5)
+        self.assertFalse(flushed.is_alive())
+        self.assertEqual(len([name for name in os.listdir(self.screenshot.directory) if name.endswith(".png")]), 1)
+
 
 class TestGameRenderer(unittest.TestCase):
     def setUp(self):
@@ -185,3 +233,83 @@ class TestGameRenderer(unittest.TestCase):
         pause_screen = pygame.surfarray.array3d(self.screen)
         self.assertTrue((pause_screen != BACKGROUND).any())
         self.assertFalse((pause_screen == game_over_screen).all())
+
+    def test_text_surface_cache(self):
+        """Test unchanged text is rasterized once and the cache stays bounded."""
+        self.renderer.render_text(self.screen, "Score: 1", (255, 255, 255), (10, 10))
+        surface = self.renderer._get_text_surface("Score: 1", (255, 255, 255), 32)  # pylint: disable=protected-access
+        self.renderer.render_text(self.screen, "Score: 1", (255, 255, 255), (10, 10))
+        self.assertIs(self.renderer._get_text_surface("Score: 1", (255, 255, 255), 32), surface)  # pylint: disable=protected-access
+
+        for score in range(GameRenderer.text_cache_size + 10):
+            self.renderer.render_text(self.screen, f"Score: {score}", (255, 255, 255), (10, 10))
+        self.assertEqual(len(self.renderer._text_cache), GameRenderer.text_cache_size)  # pylint: disable=protected-access
+
+    def test_dirty_rect_rendering_matches_full_redraw(self):
+        """Test dirty-rect frames are pixel-identical to full redraws."""
+        dirty_renderer = GameRenderer(dirty_rects=True)
+        dirty_screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        full_screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+        obstacles = Obstacle()
+        obstacles.positions = {(3, 12), (15, 2)}
+        snake = Snake(obstacles.free_cells)
+        snake.positions = [(4, 7), (3, 7), (2, 7)]
+        snake.direction = RIGHT
+        food = Food(obstacles)
+        food.foods = [food._create_food_item((10, 1)), food._create_food_item((5, 13))]  # pylint: disable=protected-access
+        start_time = pygame.time.get_ticks()
+
+        for frame in range(8):
+            snake.interpolation = (frame % 4) / 4
+            if frame % 4 == 0:
+                snake.update(obstacles)
+            dirty_renderer.render_game(dirty_screen, snake, food, obstacles, frame, 10, start_time)
+            self.renderer.render_game(full_screen, snake, food, obstacles, frame, 10, start_time)
+            if frame > 0:
+                self.assertIsNotNone(dirty_renderer._update_rects)  # pylint: disable=protected-access
+            self.assertTrue((pygame.surfarray.array3d(dirty_screen) == pygame.surfarray.array3d(full_screen)).all())
+        dirty_renderer.present()
+
+    def test_dirty_rects_fall_back_to_full_redraw(self):
+        """Test objects that don't report their areas force a full redraw."""
+
+        class MockObject:
+            def render(self, screen):
+                pass
+
+        renderer = GameRenderer(dirty_rects=True)
+        renderer.render_game(self.screen, MockObject(), MockObject(), MockObject(), 0, 0, pygame.time.get_ticks())
+        self.assertIsNone(renderer._update_rects)  # pylint: disable=protected-access
+        self.assertTrue(renderer._full_redraw)  # pylint: disable=protected-access
+
+    def test_profiler_overlay(self):
+        """Test the profiler overlay turns profiling on, shows each span and is erased like other drawing."""
+        renderer = GameRenderer(dirty_rects=True)
+        obstacles = Obstacle()
+        snake = Snake(obstacles.free_cells)
+        food = Food(obstacles)
+        start_time = pygame.time.get_ticks()
+        try:
+            renderer.toggle_profiler()
+            self.assertTrue(profiler.enabled)
+            for _ in range(3):
+                profiler.begin_frame()
+                renderer.render_game(self.screen, snake, food, obstacles, 0, 0, start_time)
+                profiler.end_frame()
+            self.assertTrue({"frame", "snake", "food", "obstacles", "particles", "hud"} <= set(profiler.percentiles()))
+
+            # The panel is redrawn with the latest numbers once it's stale
+            renderer._profiler_drawn_at -= GameRenderer.profiler_refresh_ms  # pylint: disable=protected-access
+            renderer.render_game(self.screen, snake, food, obstacles, 0, 0, start_time)
+            panel = renderer._profiler_panel  # pylint: disable=protected-access
+            self.assertGreaterEqual(panel.get_height(), get_font(16, bold=False).get_linesize() * (1 + len(profiler.percentiles())))  # Header and a row per span
+            self.assertIn(panel.get_rect(bottomleft=(10, WINDOW_HEIGHT - 10)), renderer._previous_rects)  # pylint: disable=protected-access
+
+            renderer.toggle_profiler()
+            self.assertFalse(profiler.enabled)
+            renderer.render_game(self.screen, snake, food, obstacles, 0, 0, start_time)
+            self.assertNotIn(panel.get_rect(bottomleft=(10, WINDOW_HEIGHT - 10)), renderer._previous_rects)  # pylint: disable=protected-access
+        finally:
+            if profiler.enabled:
+                profiler.toggle()